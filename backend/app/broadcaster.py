@@ -0,0 +1,163 @@
+from fastapi import WebSocket, WebSocketDisconnect
+from typing import Dict, List, Optional, Set, Tuple
+from .models.monitoring import MonitoringResponse
+import asyncio
+import json
+
+# Fields identifying a row within its section; a transition is a row appearing,
+# disappearing, or changing status under the same identity
+ROW_KEY_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "url_maps": ("project_id", "url_map_name", "hostname"),
+    "pods": ("project_id", "cluster_name", "namespace", "pod_name"),
+    "pubsub": ("project_id", "subscription_name"),
+    "node_pools": ("project_id", "cluster_name", "node_pool_name"),
+    "node_pressure": ("project_id", "cluster_name", "node_pool_name"),
+    "pod_restarts": ("project_id", "cluster_name", "namespace", "pod_name"),
+    "k8s_events": ("project_id", "cluster_name", "reason", "namespace", "object_kind", "object_name"),
+    "latency": ("project_id", "backend_service"),
+    "spanner": ("project_id", "instance_name", "metric_type"),
+    "api_health": ("api", "project_id", "target"),
+}
+
+# Messages queued per client before it is considered too slow and dropped
+CLIENT_QUEUE_SIZE = 100
+
+_KEY_FIELDS_JSON = json.dumps(ROW_KEY_FIELDS).encode()
+
+
+def _row_status(row: dict) -> str:
+    # Pod rows keep the phase in status and the icon in status_icon
+    return row.get("status_icon") or row.get("status")
+
+
+class TransitionBroadcaster:
+    """
+    Diffs consecutive snapshots and pushes only the transitions to every
+    connected WebSocket client. Each message is serialized once and the same
+    text is queued for all clients; slow clients are disconnected rather
+    than holding up the others.
+    """
+
+    def __init__(self):
+        self.clients: Set[asyncio.Queue] = set()
+        self._statuses: Dict[str, Dict[tuple, str]] = {}
+        self._errors: List[str] = []
+        self._snapshot_json: Optional[bytes] = None
+
+    def initial_message(self) -> Optional[str]:
+        """Full snapshot sent to a client when it connects"""
+        if self._snapshot_json is None:
+            return None
+        return (
+            b'{"type":"snapshot","key_fields":' + _KEY_FIELDS_JSON
+            + b',"data":' + self._snapshot_json + b'}'
+        ).decode()
+
+    def diff(self, snapshot: MonitoringResponse) -> List[dict]:
+        """Transitions since the previous snapshot; also records the new state"""
+        transitions = []
+
+        for section, key_fields in ROW_KEY_FIELDS.items():
+            previous = self._statuses.get(section, {})
+            current = {}
+
+            for row in getattr(snapshot, section):
+                row = row.model_dump()
+                key = tuple(row[field] for field in key_fields)
+                status = _row_status(row)
+                current[key] = status
+
+                if key not in previous:
+                    transitions.append({"kind": "appeared", "section": section, "row": row})
+                elif previous[key] != status:
+                    transitions.append({
+                        "kind": "changed", "section": section, "row": row, "previous_status": previous[key]
+                    })
+
+            for key, status in previous.items():
+                if key not in current:
+                    transitions.append({
+                        "kind": "disappeared", "section": section,
+                        "row": dict(zip(key_fields, key)), "previous_status": status
+                    })
+
+            self._statuses[section] = current
+
+        return transitions
+
+    def publish(self, snapshot: MonitoringResponse, snapshot_json: Optional[bytes] = None):
+        """Feed a new snapshot; queues one serialized transitions message for all clients"""
+        first = self._snapshot_json is None
+        self._snapshot_json = snapshot_json or snapshot.model_dump_json().encode()
+
+        transitions = self.diff(snapshot)
+        errors_changed = snapshot.errors != self._errors
+        self._errors = list(snapshot.errors)
+
+        if first:
+            # Clients that connected before the first snapshot get it in full
+            message = self.initial_message()
+        elif transitions or errors_changed:
+            message = json.dumps({
+                "type": "transitions",
+                "timestamp": snapshot.timestamp,
+                "errors": snapshot.errors,
+                "transitions": transitions,
+            })
+        else:
+            return
+
+        for queue in list(self.clients):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Too slow to keep up; dropping it makes the client reconnect and resync
+                self.clients.discard(queue)
+
+    @staticmethod
+    async def _wait_for_disconnect(websocket: WebSocket):
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    async def serve(self, websocket: WebSocket):
+        """Stream the snapshot and then transitions to one client until it disconnects"""
+        await websocket.accept()
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        self.clients.add(queue)
+        disconnected = asyncio.ensure_future(self._wait_for_disconnect(websocket))
+
+        try:
+            initial = self.initial_message()
+            if initial is not None:
+                await websocket.send_text(initial)
+
+            while queue in self.clients or not queue.empty():
+                getter = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait(
+                    {getter, disconnected}, timeout=30, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if disconnected in done:
+                    getter.cancel()
+                    return
+
+                if getter in done:
+                    message = getter.result()
+                else:
+                    # Keep idle connections alive through proxies
+                    getter.cancel()
+                    message = '{"type":"ping"}'
+
+                await websocket.send_text(message)
+
+            # Dropped for being too slow; the client reconnects and gets a fresh snapshot
+            await websocket.close(code=1013, reason="Client too slow")
+        except (WebSocketDisconnect, OSError):
+            pass
+        finally:
+            self.clients.discard(queue)
+            disconnected.cancel()
+
+
+broadcaster = TransitionBroadcaster()
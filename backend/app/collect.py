@@ -0,0 +1,179 @@
+"""
+Headless collector for cron jobs and CI gates.
+
+Runs the same monitors as the API server once and streams one NDJSON line
+per (project, section) as it finishes, then a summary line. Exits 1 if any
+row is RED or any section failed.
+
+Run from the backend directory:
+    python -m app.collect --sections pods,pubsub --projects my-project --parallelism 16
+"""
+from contextlib import redirect_stdout
+from datetime import datetime
+from typing import List, Optional, TextIO
+from . import config as config_module
+from .collector import SECTIONS, enabled_sections, resolve_clusters, row_status, run_section
+from .config import ProjectConfig, load_config
+from .models.monitoring import StatusType
+from .services.cluster_discovery import refresh_clusters
+from .services.gcp_calls import api_health
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    section_names = [section.name for section in SECTIONS]
+
+    parser = argparse.ArgumentParser(prog="python -m app.collect", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--config", help="path to config.json (default: the repository's config.json)")
+    parser.add_argument("--projects", help="comma-separated project IDs (default: every configured project)")
+    parser.add_argument("--sections", help=f"comma-separated sections (default: all enabled): {','.join(section_names)}")
+    parser.add_argument("--parallelism", type=int, default=8, help="sections collected at once (default: 8)")
+    parser.add_argument("--output", help="write NDJSON to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    args.projects = [name.strip() for name in args.projects.split(",") if name.strip()] if args.projects else None
+    args.sections = [name.strip() for name in args.sections.split(",") if name.strip()] if args.sections else None
+
+    unknown = set(args.sections or []) - set(section_names)
+    if unknown:
+        parser.error(f"unknown sections: {', '.join(sorted(unknown))}")
+    if args.parallelism < 1:
+        parser.error("--parallelism must be at least 1")
+
+    return args
+
+
+def select_projects(projects: List[ProjectConfig], project_ids: Optional[List[str]]) -> List[ProjectConfig]:
+    if project_ids is None:
+        return list(projects)
+
+    configured = {project.project_id: project for project in projects}
+    missing = [project_id for project_id in project_ids if project_id not in configured]
+    if missing:
+        raise SystemExit(f"Projects not in config.json: {', '.join(missing)}")
+
+    return [configured[project_id] for project_id in project_ids]
+
+
+def write_line(out: TextIO, record: dict):
+    out.write(json.dumps(record, default=str) + "\n")
+    out.flush()
+
+
+async def collect(args: argparse.Namespace, out: TextIO) -> int:
+    """Collect every selected section and stream the results; returns the exit code"""
+    started = time.monotonic()
+    projects = select_projects(load_config().projects, args.projects)
+    semaphore = asyncio.Semaphore(args.parallelism)
+
+    async def limited(coroutine):
+        async with semaphore:
+            return await coroutine
+
+    sections = {
+        project.project_id: [
+            section for section in enabled_sections(project)
+            if args.sections is None or section.name in args.sections
+        ]
+        for project in projects
+    }
+
+    # There is no background refresher in a one-shot run: revalidate the cached
+    # inventory now, or new clusters are never seen and deleted ones never dropped
+    discovered = [
+        project.project_id for project in projects
+        if not project.gke_clusters and any(section.needs_clusters for section in sections[project.project_id])
+    ]
+    if discovered:
+        await refresh_clusters(discovered)
+
+    # Discover clusters once per project, with the same parallelism limit
+    all_clusters = await asyncio.gather(
+        *[limited(resolve_clusters(project)) for project in projects],
+        return_exceptions=True
+    )
+
+    async def collect_section(project, section, clusters):
+        section_started = time.monotonic()
+        try:
+            if isinstance(clusters, Exception):
+                raise clusters
+            rows, error = await limited(run_section(section, project, clusters)), None
+        except Exception as e:
+            rows, error = [], str(e)
+        return project, section, rows, error, time.monotonic() - section_started
+
+    tasks = [
+        collect_section(project, section, clusters)
+        for project, clusters in zip(projects, all_clusters)
+        for section in sections[project.project_id]
+    ]
+
+    counts = {StatusType.RED: 0, StatusType.YELLOW: 0}
+    failed = 0
+
+    # Results are written in completion order, not config order
+    for finished in asyncio.as_completed(tasks):
+        project, section, rows, error, duration = await finished
+
+        statuses = [row_status(row) for row in rows]
+        for status in (StatusType.RED, StatusType.YELLOW):
+            counts[status] += statuses.count(status)
+        failed += error is not None
+
+        if error or StatusType.RED in statuses:
+            status = StatusType.RED
+        elif StatusType.YELLOW in statuses:
+            status = StatusType.YELLOW
+        else:
+            status = StatusType.GREEN
+
+        write_line(out, {
+            "type": "section",
+            "project_id": project.project_id,
+            "section": section.name,
+            "status": status.name,
+            "rows": [row.model_dump(mode="json") for row in rows],
+            "error": error,
+            "duration_seconds": round(duration, 3),
+            "timestamp": datetime.utcnow().isoformat(),
+        })
+
+    exit_code = 1 if counts[StatusType.RED] or failed else 0
+    write_line(out, {
+        "type": "summary",
+        "status": "RED" if exit_code else ("YELLOW" if counts[StatusType.YELLOW] else "GREEN"),
+        "projects": len(projects),
+        "sections": len(tasks),
+        "red_rows": counts[StatusType.RED],
+        "yellow_rows": counts[StatusType.YELLOW],
+        "failed_sections": failed,
+        "api_health": [row.model_dump(mode="json") for row in api_health()],
+        "duration_seconds": round(time.monotonic() - started, 3),
+        "timestamp": datetime.utcnow().isoformat(),
+    })
+
+    return exit_code
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.config:
+        config_module.CONFIG_PATH = args.config
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    try:
+        # Monitors print their errors; keep them out of the NDJSON stream
+        with redirect_stdout(sys.stderr):
+            return asyncio.run(collect(args, out))
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,430 @@
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+from .config import Config, ConfigDiff, GKEClusterConfig, ProjectConfig
+from .models.monitoring import MonitoringResponse, StatusType
+from .broadcaster import ROW_KEY_FIELDS
+from .services.cluster_discovery import discover_gke_clusters
+from .services.gcp_calls import CallCounter, api_health, call_counter
+from datetime import datetime
+import asyncio
+import importlib
+import os
+import time
+
+# Background collection interval; 0 keeps the on-demand behaviour where every
+# /api/metrics request scrapes all projects
+COLLECT_INTERVAL_SECONDS = float(os.environ.get("COLLECT_INTERVAL_SECONDS", "0"))
+
+# Bounds for the adaptive per-job polling interval
+POLL_MIN_SECONDS = float(os.environ.get("POLL_MIN_SECONDS", "15"))
+POLL_MAX_SECONDS = float(os.environ.get("POLL_MAX_SECONDS", "900"))
+
+# Global API budget for the background collector; 0 means unlimited
+RPC_BUDGET_PER_MINUTE = float(os.environ.get("RPC_BUDGET_PER_MINUTE", "0"))
+
+# Interval multipliers applied after each run
+POLL_TIGHTEN_FACTOR = 0.5
+POLL_BACKOFF_FACTOR = 1.5
+
+# Relative change of a classified value between runs that counts as changing
+POLL_CHANGE_TOLERANCE = 0.1
+
+
+class Section(NamedTuple):
+    name: str  # MonitoringResponse field
+    config_flag: str  # ProjectConfig flag enabling it
+    needs_clusters: bool
+    monitor: str  # "module:function" under app.services, imported on first use
+    value_fields: Tuple[str, ...] = ()  # row values classified against thresholds
+
+
+# Monitors pull in heavy client libraries (compute, monitoring, spanner,
+# kubernetes), so none of them is imported until a project enables it
+SECTIONS = [
+    Section("url_maps", "monitor_url_maps", False, "urlmap_monitor:monitor_url_maps", ("error_ratio",)),
+    Section("pods", "monitor_gke_pods", True, "gke_pods_monitor:monitor_gke_pods"),
+    Section("pubsub", "monitor_pubsub", False, "pubsub_monitor:monitor_pubsub",
+            ("oldest_message_age_minutes", "forecast_age_minutes")),
+    Section("node_pools", "monitor_gke_nodes", True, "gke_nodes_monitor:monitor_gke_nodes",
+            ("utilization_percent",)),
+    Section("node_pressure", "monitor_node_pressure", True, "node_pressure_monitor:monitor_node_pressure",
+            ("cpu_requested_percent", "memory_requested_percent")),
+    Section("pod_restarts", "monitor_pod_restarts", True, "pod_restart_monitor:monitor_pod_restarts",
+            ("restarts_60m",)),
+    Section("k8s_events", "monitor_k8s_events", True, "k8s_events_monitor:monitor_k8s_events", ("count_10m",)),
+    Section("latency", "monitor_latency", False, "latency_monitor:monitor_latency", ("p95_latency_seconds",)),
+    Section("spanner", "monitor_spanner", False, "spanner_monitor:monitor_spanner", ("value_percent",)),
+]
+
+_monitors: Dict[str, Callable] = {}
+
+
+def enabled_sections(project: ProjectConfig) -> List[Section]:
+    """Sections switched on for a project"""
+    return [section for section in SECTIONS if getattr(project, section.config_flag)]
+
+
+async def load_monitor(section: Section) -> Callable:
+    """A section's monitor function; the first call imports its module off the event loop"""
+    monitor = _monitors.get(section.name)
+    if monitor is None:
+        module_name, function_name = section.monitor.split(":")
+        module = await asyncio.to_thread(importlib.import_module, f".services.{module_name}", __package__)
+        monitor = _monitors[section.name] = getattr(module, function_name)
+    return monitor
+
+
+async def preload_monitors(config: Config) -> List[str]:
+    """Import the monitors enabled by any project, so the first scrape does not pay for it"""
+    names = {section.name for project in config.projects for section in enabled_sections(project)}
+    sections = [section for section in SECTIONS if section.name in names]
+
+    for section in sections:
+        try:
+            await load_monitor(section)
+        except Exception as e:
+            print(f"Error loading monitor {section.monitor}: {str(e)}")
+
+    return [section.name for section in sections]
+
+
+async def resolve_clusters(project: ProjectConfig) -> List[GKEClusterConfig]:
+    """Configured clusters, or auto-discovered ones if none are configured"""
+    return project.gke_clusters or await discover_gke_clusters(project.project_id)
+
+
+async def run_section(section: Section, project: ProjectConfig, clusters: List[GKEClusterConfig]) -> List:
+    """Run one monitor for one project"""
+    monitor = await load_monitor(section)
+    if section.needs_clusters:
+        if not clusters:
+            return []
+        return await monitor(project.project_id, clusters)
+    return await monitor(project.project_id)
+
+
+def row_status(row) -> str:
+    """Status icon of a row (pod rows keep the phase in status and the icon in status_icon)"""
+    return getattr(row, "status_icon", None) or row.status
+
+
+def build_response(rows: Dict[str, List], errors: List[str], timestamp: Optional[str] = None) -> MonitoringResponse:
+    """Assemble a MonitoringResponse from per-section rows"""
+    return MonitoringResponse(
+        **rows,
+        api_health=api_health(),
+        timestamp=timestamp or datetime.utcnow().isoformat(),
+        errors=errors
+    )
+
+
+async def collect_metrics(config: Config) -> MonitoringResponse:
+    """Scrape every enabled section of every configured project once"""
+    rows: Dict[str, List] = {section.name: [] for section in SECTIONS}
+    errors = []
+
+    # Auto-discover GKE clusters for all projects at once
+    all_clusters = await asyncio.gather(
+        *[resolve_clusters(project) for project in config.projects]
+    )
+
+    # Process each project
+    for project, clusters in zip(config.projects, all_clusters):
+        try:
+            sections = enabled_sections(project)
+
+            # Execute all monitors for this project concurrently
+            results = await asyncio.gather(
+                *[run_section(section, project, clusters) for section in sections],
+                return_exceptions=True
+            )
+
+            # Collect results
+            for section, result in zip(sections, results):
+                if isinstance(result, Exception):
+                    errors.append(f"Error in {section.name} for {project.project_id}: {str(result)}")
+                    continue
+                rows[section.name].extend(result)
+
+        except Exception as e:
+            errors.append(f"Error processing project {project.project_id}: {str(e)}")
+
+    return build_response(rows, errors)
+
+
+def rows_fingerprint(section: Section, rows: List) -> Dict[tuple, tuple]:
+    """Status and classified values of each row, by row identity"""
+    key_fields = ROW_KEY_FIELDS.get(section.name, ())
+    return {
+        tuple(getattr(row, field) for field in key_fields):
+            (row_status(row),) + tuple(getattr(row, field) for field in section.value_fields)
+        for row in rows
+    }
+
+
+def fingerprint_changed(old: Dict[tuple, tuple], new: Dict[tuple, tuple]) -> bool:
+    """Rows appeared or disappeared, a status changed, or a classified value moved by more than the tolerance"""
+    if old.keys() != new.keys():
+        return True
+
+    for key, (status, *values) in new.items():
+        old_status, *old_values = old[key]
+        if status != old_status:
+            return True
+
+        for value, old_value in zip(values, old_values):
+            if value is None or old_value is None:
+                if value != old_value:
+                    return True
+            elif abs(value - old_value) > POLL_CHANGE_TOLERANCE * max(abs(value), abs(old_value)):
+                return True
+
+    return False
+
+
+class CollectionJob:
+    """Latest result of one (project, section) pair collected in the background"""
+
+    def __init__(self, project: ProjectConfig, section: Section):
+        self.project = project
+        self.section = section
+        self.rows: List = []
+        self.error: Optional[str] = None
+        self.next_run = 0.0
+        self.interval = 0.0
+        self.cost = 1.0  # estimated API calls per run
+        self.running = False
+        self.fingerprint: Optional[Tuple[Optional[str], Dict[tuple, tuple]]] = None
+
+    def severity(self) -> int:
+        """2 if anything is RED or failing, 1 if anything is YELLOW, else 0"""
+        if self.error:
+            return 2
+        statuses = {row_status(row) for row in self.rows}
+        if StatusType.RED in statuses:
+            return 2
+        if StatusType.YELLOW in statuses:
+            return 1
+        return 0
+
+
+class Collector:
+    """
+    Background scheduler that keeps one collection job per enabled
+    (project, section) and serves the latest results as a snapshot.
+
+    Each job starts at the base interval. It is polled more often while its
+    rows are YELLOW/RED or changing, and backs off while it is stable and
+    green, within [POLL_MIN_SECONDS, POLL_MAX_SECONDS]. Runs are paid for
+    from a shared token bucket of RPC_BUDGET_PER_MINUTE calls, most severe
+    jobs first.
+    """
+
+    def __init__(self, interval: float = COLLECT_INTERVAL_SECONDS,
+                 min_interval: float = POLL_MIN_SECONDS, max_interval: float = POLL_MAX_SECONDS,
+                 rpc_budget_per_minute: float = RPC_BUDGET_PER_MINUTE):
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.rpc_budget_per_minute = rpc_budget_per_minute
+        self._budget = rpc_budget_per_minute
+        self._budget_refilled_at = time.monotonic()
+        self.jobs: Dict[Tuple[str, str], CollectionJob] = {}
+        self.version = 0
+        self.updated_at: Optional[str] = None
+        self._snapshot: Optional[MonitoringResponse] = None
+        self._snapshot_version = -1
+        self._snapshot_json: Optional[bytes] = None
+        self._snapshot_json_version = -1
+        self.listeners: List[Callable] = []
+        self._tasks: Set[asyncio.Task] = set()
+
+    def apply_config(self, config: Config, diff: Optional[ConfigDiff] = None):
+        """
+        Add or drop jobs to match the config. With a diff only the affected
+        projects are touched, so unchanged projects keep their results.
+        """
+        if diff is None:
+            projects = config.projects
+            stale_project_ids = {project_id for project_id, _ in self.jobs} - {p.project_id for p in projects}
+        else:
+            projects = diff.added + diff.changed
+            stale_project_ids = {project.project_id for project in diff.removed}
+
+        for key in [key for key in self.jobs if key[0] in stale_project_ids]:
+            del self.jobs[key]
+
+        for project in projects:
+            wanted = {section.name: section for section in enabled_sections(project)}
+
+            for key in [key for key in self.jobs if key[0] == project.project_id and key[1] not in wanted]:
+                del self.jobs[key]
+
+            for name, section in wanted.items():
+                job = self.jobs.get((project.project_id, name))
+                if job is None:
+                    job = self.jobs[(project.project_id, name)] = CollectionJob(project, section)
+                    job.interval = self.interval
+                elif job.project != project:
+                    # Keep the last rows until the job reruns with the new settings
+                    job.project = project
+                    job.next_run = 0.0
+                    job.interval = self.interval
+
+        self.version += 1
+
+    async def _run_job(self, job: CollectionJob):
+        # Count the API calls this run makes so the RPC budget uses real costs
+        calls = CallCounter()
+        call_counter.set(calls)
+
+        try:
+            clusters = await resolve_clusters(job.project) if job.section.needs_clusters else []
+            job.rows = await run_section(job.section, job.project, clusters)
+            job.error = None
+        except Exception as e:
+            job.error = f"Error in {job.section.name} for {job.project.project_id}: {str(e)}"
+
+        job.cost = max(1, calls.count)
+
+    def _adapt_interval(self, job: CollectionJob):
+        """Tighten the job's interval when it is at risk or changing, back off when stable and green"""
+        # Only statuses and the values compared against thresholds count; other
+        # fields (latency percentiles, rates, totals) vary on every run
+        fingerprint = (job.error, rows_fingerprint(job.section, job.rows))
+        changed = job.fingerprint is not None and (
+            fingerprint[0] != job.fingerprint[0] or fingerprint_changed(job.fingerprint[1], fingerprint[1])
+        )
+        job.fingerprint = fingerprint
+
+        severity = job.severity()
+        if severity == 2:
+            interval = self.min_interval
+        elif severity == 1 or changed:
+            interval = job.interval * POLL_TIGHTEN_FACTOR
+        else:
+            interval = job.interval * POLL_BACKOFF_FACTOR
+
+        job.interval = min(self.max_interval, max(self.min_interval, interval))
+
+    def _take_budget(self, due: List[CollectionJob]) -> List[CollectionJob]:
+        """Jobs the RPC budget can pay for now, most severe and most frequent first"""
+        if self.rpc_budget_per_minute <= 0:
+            return due
+
+        now = time.monotonic()
+        self._budget = min(
+            self.rpc_budget_per_minute,
+            self._budget + (now - self._budget_refilled_at) * self.rpc_budget_per_minute / 60
+        )
+        self._budget_refilled_at = now
+
+        affordable = []
+        for job in sorted(due, key=lambda job: (-job.severity(), job.interval)):
+            # A job costing more than the whole budget runs whenever the bucket is full
+            cost = min(job.cost, self.rpc_budget_per_minute)
+            if cost <= self._budget:
+                self._budget -= cost
+                affordable.append(job)
+
+        return affordable
+
+    async def _run_scheduled(self, job: CollectionJob):
+        try:
+            await self._run_job(job)
+        finally:
+            job.running = False
+
+        self._adapt_interval(job)
+        job.next_run = time.monotonic() + job.interval
+
+        self.updated_at = datetime.utcnow().isoformat()
+        self.version += 1
+
+        for listener in self.listeners:
+            try:
+                listener(self)
+            except Exception as e:
+                print(f"Error notifying collector listener: {str(e)}")
+
+    def run_due_jobs(self) -> List[CollectionJob]:
+        """
+        Start every due job the RPC budget allows, each as its own task, so a
+        slow job never holds back the others; the rest wait for the next tick
+        """
+        now = time.monotonic()
+        due = self._take_budget([
+            job for job in self.jobs.values() if not job.running and job.next_run <= now
+        ])
+
+        for job in due:
+            job.running = True
+            task = asyncio.create_task(self._run_scheduled(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        return due
+
+    async def run(self):
+        """Background task: keep all jobs fresh"""
+        try:
+            while True:
+                try:
+                    self.run_due_jobs()
+                except Exception as e:
+                    print(f"Error in background collector: {str(e)}")
+
+                await asyncio.sleep(1)
+        finally:
+            # Losing the collector lease or shutting down stops the jobs in flight too
+            for task in list(self._tasks):
+                task.cancel()
+
+    def state(self) -> dict:
+        """Scheduling state of all jobs, for operators"""
+        now = time.monotonic()
+        return {
+            "base_interval_seconds": self.interval,
+            "rpc_budget_per_minute": self.rpc_budget_per_minute,
+            "rpc_budget_remaining": round(self._budget, 2),
+            "jobs": [
+                {
+                    "project_id": project_id,
+                    "section": section,
+                    "interval_seconds": round(job.interval, 1),
+                    "next_run_in_seconds": round(max(0.0, job.next_run - now), 1),
+                    "estimated_cost": job.cost,
+                    "running": job.running,
+                    "rows": len(job.rows),
+                    "error": job.error,
+                }
+                for (project_id, section), job in sorted(self.jobs.items())
+            ],
+        }
+
+    def snapshot(self) -> MonitoringResponse:
+        """Latest results of all jobs, rebuilt only when something changed"""
+        if self._snapshot_version != self.version:
+            rows: Dict[str, List] = {section.name: [] for section in SECTIONS}
+            errors = []
+
+            for job in self.jobs.values():
+                rows[job.section.name].extend(job.rows)
+                if job.error:
+                    errors.append(job.error)
+
+            self._snapshot = build_response(rows, errors, self.updated_at)
+            self._snapshot_version = self.version
+
+        return self._snapshot
+
+    def snapshot_json(self) -> bytes:
+        """Serialized snapshot, encoded once per change and shared by all readers"""
+        if self._snapshot_json_version != self.version:
+            snapshot = self.snapshot()
+            self._snapshot_json = snapshot.model_dump_json().encode()
+            self._snapshot_json_version = self._snapshot_version
+
+        return self._snapshot_json
+
+
+collector = Collector()
@@ -1,7 +1,8 @@
+import asyncio
 import json
 import os
-from typing import List, Dict
-from pydantic import BaseModel
+from typing import List, Dict, Optional, Tuple
+from pydantic import BaseModel, field_validator
 
 
 class GKEClusterConfig(BaseModel):
@@ -10,6 +11,24 @@ class GKEClusterConfig(BaseModel):
     type: str  # "regional" or "zonal"
 
 
+class ThresholdRule(BaseModel):
+    monitor: str  # e.g. "pubsub", "pod_restarts", "spanner_cpu"
+    match: str = "*"  # glob on the resource (subscription, namespace, cluster/pool, ...)
+    warning: Optional[float] = None
+    critical: Optional[float] = None
+
+    @field_validator("monitor")
+    @classmethod
+    def known_monitor(cls, monitor: str) -> str:
+        # A typo fails load_config, which then keeps the last good config.
+        # Imported here because the thresholds module imports this one
+        from .services.thresholds import DEFAULT_THRESHOLDS
+
+        if monitor not in DEFAULT_THRESHOLDS:
+            raise ValueError(f"Unknown monitor in threshold rule: {monitor} (expected one of {', '.join(DEFAULT_THRESHOLDS)})")
+        return monitor
+
+
 class ProjectConfig(BaseModel):
     project_id: str
     gke_clusters: List[GKEClusterConfig] = []
@@ -17,24 +36,118 @@ class ProjectConfig(BaseModel):
     monitor_gke_pods: bool = True
     monitor_pubsub: bool = True
     monitor_gke_nodes: bool = True
+    monitor_node_pressure: bool = True
     monitor_pod_restarts: bool = True
+    monitor_k8s_events: bool = True
     monitor_latency: bool = True
     monitor_spanner: bool = True
+    thresholds: List[ThresholdRule] = []
 
 
 class Config(BaseModel):
     projects: List[ProjectConfig]
+    thresholds: List[ThresholdRule] = []
+
+
+class ConfigDiff(BaseModel):
+    added: List[ProjectConfig] = []
+    removed: List[ProjectConfig] = []
+    changed: List[ProjectConfig] = []
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "config.json")
+
+# How often the background watcher checks config.json for changes
+CONFIG_POLL_SECONDS = float(os.environ.get("CONFIG_POLL_SECONDS", "5"))
+
+_cached_config: Optional[Config] = None
+_cached_signature: Optional[Tuple[int, int, int]] = None
+
+# Signature of a config.json that failed to load, so it is parsed and logged once
+_failed_signature: Optional[Tuple[int, int, int]] = None
+
+
+def _config_signature() -> Optional[Tuple[int, int, int]]:
+    """Identify the current config.json by inode, mtime and size"""
+    try:
+        stat = os.stat(CONFIG_PATH)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
 
 
 def load_config() -> Config:
-    """Load configuration from config.json"""
-    config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "config.json")
+    """
+    Load configuration from config.json.
+    The parsed config is cached and only re-read when the file changes.
+    """
+    global _cached_config, _cached_signature, _failed_signature
+
+    signature = _config_signature()
+    if _cached_config is not None and signature == _cached_signature:
+        return _cached_config
+    if _cached_config is not None and signature is not None and signature == _failed_signature:
+        return _cached_config
 
-    if not os.path.exists(config_path):
+    if signature is None:
         # Return empty config if file doesn't exist
-        return Config(projects=[])
+        config = Config(projects=[])
+    else:
+        try:
+            with open(CONFIG_PATH, "r") as f:
+                data = json.load(f)
+            config = Config(**data)
+        except Exception as e:
+            if _cached_config is None:
+                raise
+            # Keep serving the last good config while the file is being edited
+            _failed_signature = signature
+            print(f"Error reloading {CONFIG_PATH}, keeping previous config: {str(e)}")
+            return _cached_config
+
+    _cached_config = config
+    _cached_signature = signature
+
+    return config
+
+
+def diff_configs(old: Config, new: Config) -> ConfigDiff:
+    """Compare two configs project by project"""
+    old_projects: Dict[str, ProjectConfig] = {project.project_id: project for project in old.projects}
+    new_projects: Dict[str, ProjectConfig] = {project.project_id: project for project in new.projects}
+
+    return ConfigDiff(
+        added=[project for project_id, project in new_projects.items() if project_id not in old_projects],
+        removed=[project for project_id, project in old_projects.items() if project_id not in new_projects],
+        changed=[
+            project for project_id, project in new_projects.items()
+            if project_id in old_projects and project != old_projects[project_id]
+        ],
+    )
+
+
+async def watch_config(on_change):
+    """
+    Background task: poll config.json and call on_change(old, new, diff)
+    whenever the parsed config changes.
+    """
+    current = load_config()
+
+    while True:
+        await asyncio.sleep(CONFIG_POLL_SECONDS)
 
-    with open(config_path, "r") as f:
-        data = json.load(f)
+        try:
+            new = load_config()
+            if new is current:
+                continue
 
-    return Config(**data)
+            diff = diff_configs(current, new)
+            previous, current = current, new
+            if not diff.is_empty:
+                await on_change(previous, new, diff)
+        except Exception as e:
+            print(f"Error applying config change: {str(e)}")
@@ -1,6 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .routers import monitoring
+from .routers import monitoring, stream
+from .config import diff_configs, load_config, watch_config
+from .collector import collector, preload_monitors
+from .broadcaster import broadcaster
+from .models.monitoring import MonitoringResponse
+from .snapshot_store import LEASE_TTL_SECONDS, snapshot_store
+from .sharding import shard_config
+from .services.cluster_discovery import forget_project, run_discovery_refresher
+import asyncio
 
 app = FastAPI(
     title="GCP/GKE Monitoring Dashboard API",
@@ -19,6 +27,113 @@ app.add_middleware(
 
 # Include routers
 app.include_router(monitoring.router, prefix="/api", tags=["monitoring"])
+app.include_router(stream.router, tags=["stream"])
+
+background_tasks = []
+
+
+def _projects_to_discover():
+    return [project.project_id for project in shard_config(load_config()).projects if not project.gke_clusters]
+
+
+async def _on_config_change(old, new, diff):
+    # Only projects of this replica's shard are collected here
+    new = shard_config(new)
+    diff = diff_configs(shard_config(old), new)
+    if diff.is_empty:
+        return
+
+    # Only the added, changed and removed projects are touched; the others keep their caches
+    for project in diff.removed:
+        forget_project(project.project_id)
+    collector.apply_config(new, diff)
+    print(
+        f"Reloaded config.json: {len(diff.added)} added, "
+        f"{len(diff.changed)} changed, {len(diff.removed)} removed projects"
+    )
+
+
+async def _run_elected_collector():
+    """
+    Multi-worker mode: workers compete for the collector lease. Only the
+    holder scrapes GCP and publishes snapshots to the shared store.
+    """
+    leader_tasks = []
+    collector.listeners.append(lambda c: snapshot_store.publish(c.snapshot_json()))
+
+    try:
+        while True:
+            try:
+                is_leader = snapshot_store.try_acquire_lease()
+            except Exception as e:
+                print(f"Error renewing collector lease: {str(e)}")
+                is_leader = False
+
+            if is_leader and not leader_tasks:
+                print(f"Worker {snapshot_store.holder} elected as collector")
+                collector.apply_config(shard_config(load_config()))
+                leader_tasks = [
+                    asyncio.create_task(collector.run()),
+                    asyncio.create_task(run_discovery_refresher(_projects_to_discover)),
+                ]
+            elif not is_leader and leader_tasks:
+                print(f"Worker {snapshot_store.holder} lost the collector lease")
+                for task in leader_tasks:
+                    task.cancel()
+                leader_tasks = []
+
+            await asyncio.sleep(LEASE_TTL_SECONDS / 3)
+    finally:
+        for task in leader_tasks:
+            task.cancel()
+        if leader_tasks:
+            snapshot_store.release_lease()
+
+
+async def _follow_snapshot_store():
+    """Multi-worker mode: push transitions from snapshots published by the elected collector"""
+    version = -1
+
+    while True:
+        try:
+            new_version, body = snapshot_store.read()
+            if body is not None and new_version != version:
+                version = new_version
+                broadcaster.publish(MonitoringResponse.model_validate_json(body), body)
+        except Exception as e:
+            print(f"Error reading shared snapshot: {str(e)}")
+
+        await asyncio.sleep(1)
+
+
+@app.on_event("startup")
+async def start_background_tasks():
+    background_tasks.append(asyncio.create_task(watch_config(_on_config_change)))
+
+    if snapshot_store is not None:
+        # Workers serve the shared snapshot, so collection always runs in the background
+        if collector.interval <= 0:
+            collector.interval = 60
+        background_tasks.append(asyncio.create_task(_run_elected_collector()))
+        background_tasks.append(asyncio.create_task(_follow_snapshot_store()))
+        return
+
+    # /api/health is served right away; the enabled monitors load in the background
+    background_tasks.append(asyncio.create_task(preload_monitors(shard_config(load_config()))))
+
+    # Serve the cached cluster inventory right away and revalidate it in the background
+    background_tasks.append(asyncio.create_task(run_discovery_refresher(_projects_to_discover)))
+
+    if collector.interval > 0:
+        collector.listeners.append(lambda c: broadcaster.publish(c.snapshot(), c.snapshot_json()))
+        collector.apply_config(shard_config(load_config()))
+        background_tasks.append(asyncio.create_task(collector.run()))
+
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    for task in background_tasks:
+        task.cancel()
 
 
 @app.get("/")
@@ -28,6 +143,7 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "metrics": "/api/metrics",
+            "stream": "/ws/metrics",
             "health": "/api/health"
         }
     }
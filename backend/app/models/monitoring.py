@@ -17,6 +17,11 @@ class UrlMapMetric(BaseModel):
     http_status: Optional[int]
     status: str
     error: Optional[str] = None
+    p50_ms: Optional[float] = None
+    p95_ms: Optional[float] = None
+    p99_ms: Optional[float] = None
+    error_ratio: float = 0.0
+    probes: int = 0
 
 
 class PodMetric(BaseModel):
@@ -33,6 +38,11 @@ class PubSubMetric(BaseModel):
     subscription_name: str
     unacked_messages: int
     oldest_message_age_minutes: float
+    backlog_growth_per_minute: float = 0.0
+    ack_rate_per_second: float = 0.0
+    publish_rate_per_second: float = 0.0
+    time_to_drain_minutes: Optional[float] = None  # None: the backlog is not draining
+    forecast_age_minutes: float = 0.0
     status: str
 
 
@@ -47,12 +57,39 @@ class NodePoolMetric(BaseModel):
     is_regional: bool
 
 
+class NodePressureMetric(BaseModel):
+    project_id: str
+    cluster_name: str
+    node_pool_name: str
+    node_count: int
+    saturated_nodes: int
+    cpu_requested_percent: float
+    memory_requested_percent: float
+    max_node_cpu_percent: float
+    max_node_memory_percent: float
+    status: str
+
+
 class PodRestartMetric(BaseModel):
     project_id: str
     cluster_name: str
     namespace: str
     pod_name: str
     restart_count: int
+    restarts_10m: int = 0
+    restarts_60m: int = 0
+    status: str
+
+
+class K8sEventMetric(BaseModel):
+    project_id: str
+    cluster_name: str
+    reason: str
+    namespace: str
+    object_kind: str
+    object_name: str
+    count_10m: int
+    count_60m: int
     status: str
 
 
@@ -71,13 +108,28 @@ class SpannerMetric(BaseModel):
     status: str
 
 
+class ApiHealthMetric(BaseModel):
+    api: str
+    project_id: str
+    target: str
+    state: str  # "closed", "open" or "half_open"
+    consecutive_failures: int
+    retries: int
+    throttled_calls: int
+    last_error: Optional[str] = None
+    status: str
+
+
 class MonitoringResponse(BaseModel):
     url_maps: List[UrlMapMetric] = []
     pods: List[PodMetric] = []
     pubsub: List[PubSubMetric] = []
     node_pools: List[NodePoolMetric] = []
+    node_pressure: List[NodePressureMetric] = []
     pod_restarts: List[PodRestartMetric] = []
+    k8s_events: List[K8sEventMetric] = []
     latency: List[LatencyMetric] = []
     spanner: List[SpannerMetric] = []
+    api_health: List[ApiHealthMetric] = []
     timestamp: str
     errors: List[str] = []
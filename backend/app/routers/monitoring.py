@@ -1,16 +1,12 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from ..models.monitoring import MonitoringResponse
 from ..config import load_config
-from ..services.urlmap_monitor import monitor_url_maps
-from ..services.gke_pods_monitor import monitor_gke_pods
-from ..services.pubsub_monitor import monitor_pubsub
-from ..services.gke_nodes_monitor import monitor_gke_nodes
-from ..services.pod_restart_monitor import monitor_pod_restarts
-from ..services.latency_monitor import monitor_latency
-from ..services.spanner_monitor import monitor_spanner
-from ..services.cluster_discovery import discover_gke_clusters
+from ..collector import collector, collect_metrics
+from ..snapshot_store import snapshot_store
+from ..sharding import SHARD_URLS, merge_responses, shard_config
 from datetime import datetime
 import asyncio
+import httpx
 
 router = APIRouter()
 
@@ -29,92 +25,60 @@ async def get_metrics():
                 errors=["No projects configured in config.json"]
             )
 
-        all_url_maps = []
-        all_pods = []
-        all_pubsub = []
-        all_node_pools = []
-        all_pod_restarts = []
-        all_latency = []
-        all_spanner = []
-        errors = []
-
-        # Process each project
-        for project in config.projects:
-            try:
-                # Auto-discover GKE clusters if not provided in config
-                gke_clusters = project.gke_clusters
-                if not gke_clusters:
-                    gke_clusters = await discover_gke_clusters(project.project_id)
-
-                # Run all monitoring tasks concurrently for this project
-                tasks = []
-
-                if project.monitor_url_maps:
-                    tasks.append(("url_maps", monitor_url_maps(project.project_id)))
-
-                if project.monitor_gke_pods and gke_clusters:
-                    tasks.append(("pods", monitor_gke_pods(project.project_id, gke_clusters)))
-
-                if project.monitor_pubsub:
-                    tasks.append(("pubsub", monitor_pubsub(project.project_id)))
-
-                if project.monitor_gke_nodes and gke_clusters:
-                    tasks.append(("nodes", monitor_gke_nodes(project.project_id, gke_clusters)))
-
-                if project.monitor_pod_restarts and gke_clusters:
-                    tasks.append(("restarts", monitor_pod_restarts(project.project_id, gke_clusters)))
-
-                if project.monitor_latency:
-                    tasks.append(("latency", monitor_latency(project.project_id)))
-
-                if project.monitor_spanner:
-                    tasks.append(("spanner", monitor_spanner(project.project_id)))
-
-                # Execute all tasks concurrently
-                results = await asyncio.gather(*[task[1] for task in tasks], return_exceptions=True)
-
-                # Collect results
-                for i, (task_name, _) in enumerate(tasks):
-                    result = results[i]
-
-                    if isinstance(result, Exception):
-                        errors.append(f"Error in {task_name} for {project.project_id}: {str(result)}")
-                        continue
-
-                    if task_name == "url_maps":
-                        all_url_maps.extend(result)
-                    elif task_name == "pods":
-                        all_pods.extend(result)
-                    elif task_name == "pubsub":
-                        all_pubsub.extend(result)
-                    elif task_name == "nodes":
-                        all_node_pools.extend(result)
-                    elif task_name == "restarts":
-                        all_pod_restarts.extend(result)
-                    elif task_name == "latency":
-                        all_latency.extend(result)
-                    elif task_name == "spanner":
-                        all_spanner.extend(result)
-
-            except Exception as e:
-                errors.append(f"Error processing project {project.project_id}: {str(e)}")
-
-        return MonitoringResponse(
-            url_maps=all_url_maps,
-            pods=all_pods,
-            pubsub=all_pubsub,
-            node_pools=all_node_pools,
-            pod_restarts=all_pod_restarts,
-            latency=all_latency,
-            spanner=all_spanner,
-            timestamp=datetime.utcnow().isoformat(),
-            errors=errors
-        )
+        # In multi-worker mode every worker serves the elected collector's snapshot as stored
+        if snapshot_store is not None:
+            _, body = snapshot_store.read()
+            if body is None:
+                return MonitoringResponse(
+                    timestamp=datetime.utcnow().isoformat(),
+                    errors=["Waiting for the first snapshot from the collector"]
+                )
+            return Response(content=body, media_type="application/json")
+
+        # Serve the background collector's snapshot when it is running
+        if collector.interval > 0:
+            return Response(content=collector.snapshot_json(), media_type="application/json")
+
+        return await collect_metrics(shard_config(config))
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch metrics: {str(e)}")
 
 
+@router.get("/metrics/aggregate", response_model=MonitoringResponse)
+async def get_aggregated_metrics():
+    """
+    Merge the metrics of all shard replicas listed in SHARD_URLS
+    """
+    if not SHARD_URLS:
+        raise HTTPException(status_code=400, detail="SHARD_URLS is not configured")
+
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        results = await asyncio.gather(
+            *[client.get(f"{url}/api/metrics") for url in SHARD_URLS],
+            return_exceptions=True
+        )
+
+    responses = []
+    errors = []
+    for url, result in zip(SHARD_URLS, results):
+        try:
+            if isinstance(result, Exception):
+                raise result
+            result.raise_for_status()
+            responses.append(MonitoringResponse.model_validate_json(result.content))
+        except Exception as e:
+            errors.append(f"Error fetching shard {url}: {str(e)}")
+
+    return merge_responses(responses, errors)
+
+
+@router.get("/collector")
+async def collector_state():
+    """Adaptive polling state of the background collector"""
+    return collector.state()
+
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, WebSocket
+from ..broadcaster import broadcaster
+from ..collector import collector
+from ..snapshot_store import snapshot_store
+
+router = APIRouter()
+
+
+@router.websocket("/ws/metrics")
+async def metrics_stream(websocket: WebSocket):
+    """
+    Push the current snapshot on connect, then only status transitions
+    """
+    # Transitions come from background collection; without it clients keep polling /api/metrics
+    if collector.interval <= 0 and snapshot_store is None:
+        await websocket.close(code=1013, reason="Background collection is disabled")
+        return
+
+    await broadcaster.serve(websocket)
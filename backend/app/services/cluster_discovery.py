@@ -1,39 +1,152 @@
-from google.cloud import container_v1
-from typing import List
+from typing import Dict, Iterable, List
 from ..config import GKEClusterConfig
+from .gcp_calls import call_api
+import asyncio
+import importlib
+import json
+import os
 
+# Known cluster inventory is persisted here so a restarted backend can serve
+# immediately and revalidate in the background
+CLUSTER_CACHE_PATH = os.environ.get(
+    "CLUSTER_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), ".cache", "clusters.json")
+)
 
-async def discover_gke_clusters(project_id: str) -> List[GKEClusterConfig]:
-    """
-    Discover all GKE clusters in a project using the Container API.
-    Returns a list of GKEClusterConfig objects.
-    """
-    clusters = []
+# Clusters are created rarely, so the inventory is refreshed on a slow timer
+DISCOVERY_REFRESH_SECONDS = int(os.environ.get("DISCOVERY_REFRESH_SECONDS", "1800"))
+
+_inventory: Dict[str, List[GKEClusterConfig]] = {}
+_inventory_loaded = False
+
+
+def _load_inventory():
+    """Load the persisted cluster inventory from disk once per process"""
+    global _inventory_loaded
+
+    if _inventory_loaded:
+        return
+    _inventory_loaded = True
+
+    if not os.path.exists(CLUSTER_CACHE_PATH):
+        return
 
     try:
-        container_client = container_v1.ClusterManagerClient()
+        with open(CLUSTER_CACHE_PATH, "r") as f:
+            data = json.load(f)
+
+        for project_id, clusters in data.items():
+            _inventory[project_id] = [GKEClusterConfig(**cluster) for cluster in clusters]
+    except Exception as e:
+        print(f"Error loading cluster cache {CLUSTER_CACHE_PATH}: {str(e)}")
 
-        # List all clusters in all locations (using '-' as wildcard)
-        parent = f"projects/{project_id}/locations/-"
 
-        response = container_client.list_clusters(parent=parent)
+def _save_inventory():
+    """Atomically persist the cluster inventory to disk"""
+    data = {
+        project_id: [cluster.model_dump() for cluster in clusters]
+        for project_id, clusters in _inventory.items()
+    }
 
-        for cluster in response.clusters:
-            # Determine if cluster is regional or zonal
-            # Regional clusters have location like "us-central1"
-            # Zonal clusters have location like "us-central1-a"
-            location = cluster.location
-            cluster_type = "zonal" if location.count('-') >= 2 else "regional"
+    try:
+        os.makedirs(os.path.dirname(CLUSTER_CACHE_PATH), exist_ok=True)
+        tmp_path = f"{CLUSTER_CACHE_PATH}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, CLUSTER_CACHE_PATH)
+    except Exception as e:
+        print(f"Error saving cluster cache {CLUSTER_CACHE_PATH}: {str(e)}")
+
+
+async def _list_clusters(project_id: str) -> List[GKEClusterConfig]:
+    """List all GKE clusters in a project using the Container API"""
+    # The Container API client is only imported once discovery is needed
+    container_v1 = await asyncio.to_thread(importlib.import_module, "google.cloud.container_v1")
+    container_client = container_v1.ClusterManagerClient()
+
+    # List all clusters in all locations (using '-' as wildcard)
+    parent = f"projects/{project_id}/locations/-"
+
+    response = await call_api("container", project_id, container_client.list_clusters, parent=parent)
+
+    clusters = []
+    for cluster in response.clusters:
+        # A zonal cluster's location is one of its node zones;
+        # a regional cluster's location is the region containing them
+        cluster_type = "zonal" if cluster.location in cluster.locations else "regional"
+
+        clusters.append(GKEClusterConfig(
+            name=cluster.name,
+            location=cluster.location,
+            type=cluster_type
+        ))
+
+    return clusters
 
-            clusters.append(GKEClusterConfig(
-                name=cluster.name,
-                location=location,
-                type=cluster_type
-            ))
 
+async def refresh_clusters(project_ids: Iterable[str]):
+    """Rediscover clusters for all given projects concurrently and persist the result"""
+    _load_inventory()
+
+    project_ids = list(project_ids)
+    results = await asyncio.gather(
+        *[_list_clusters(project_id) for project_id in project_ids],
+        return_exceptions=True
+    )
+
+    for project_id, result in zip(project_ids, results):
+        if isinstance(result, Exception):
+            # Keep serving the last known inventory for this project
+            print(f"Error discovering GKE clusters for project {project_id}: {str(result)}")
+            continue
+        _inventory[project_id] = result
+
+    _save_inventory()
+
+
+async def discover_gke_clusters(project_id: str) -> List[GKEClusterConfig]:
+    """
+    Discover all GKE clusters in a project using the Container API.
+    Returns a list of GKEClusterConfig objects, served from the cached
+    inventory when the project has been discovered before.
+    """
+    _load_inventory()
+
+    if project_id in _inventory:
+        return _inventory[project_id]
+
+    try:
+        clusters = await _list_clusters(project_id)
     except Exception as e:
         # Log error but return empty list to avoid breaking the entire monitoring
         print(f"Error discovering GKE clusters for project {project_id}: {str(e)}")
         return []
 
+    _inventory[project_id] = clusters
+    _save_inventory()
+
     return clusters
+
+
+def forget_project(project_id: str):
+    """Drop a project that is no longer configured from the inventory"""
+    _load_inventory()
+
+    if _inventory.pop(project_id, None) is not None:
+        _save_inventory()
+
+
+async def run_discovery_refresher(get_project_ids):
+    """
+    Background task: revalidate the cluster inventory for the projects
+    returned by get_project_ids() now and then every DISCOVERY_REFRESH_SECONDS.
+    """
+    _load_inventory()
+
+    while True:
+        try:
+            await refresh_clusters(get_project_ids())
+        except Exception as e:
+            print(f"Error refreshing GKE cluster inventory: {str(e)}")
+
+        await asyncio.sleep(DISCOVERY_REFRESH_SECONDS)
@@ -0,0 +1,269 @@
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+from ..models.monitoring import ApiHealthMetric, StatusType
+from .recording import recorder, replayer
+import asyncio
+import os
+import random
+import sys
+import time
+
+# Sustained calls per second allowed per (API, project)
+CALL_RATE_PER_SECOND = float(os.environ.get("CALL_RATE_PER_SECOND", "10"))
+
+# Attempts per call for retryable errors (quota exhausted, unavailable, ...)
+CALL_MAX_ATTEMPTS = int(os.environ.get("CALL_MAX_ATTEMPTS", "4"))
+CALL_BACKOFF_BASE_SECONDS = 0.5
+CALL_BACKOFF_MAX_SECONDS = 8.0
+
+# Consecutive failures that open a target's circuit, and how long it stays open
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get("BREAKER_FAILURE_THRESHOLD", "3"))
+BREAKER_COOLDOWN_SECONDS = float(os.environ.get("BREAKER_COOLDOWN_SECONDS", "120"))
+
+# A rate-limited (API, project) is reported for this long after it last waited
+THROTTLE_REPORT_SECONDS = 300
+
+_RETRYABLE_GOOGLE_ERRORS = (
+    "ResourceExhausted",
+    "TooManyRequests",
+    "ServiceUnavailable",
+    "DeadlineExceeded",
+    "InternalServerError",
+    "Aborted",
+)
+_RETRYABLE_HTTP_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a target whose circuit is open"""
+
+
+class CallCounter:
+    """Counts API calls made within a context, e.g. one collector job run"""
+
+    def __init__(self):
+        self.count = 0
+
+
+call_counter: ContextVar[Optional[CallCounter]] = ContextVar("call_counter", default=None)
+
+
+class TokenBucket:
+    """Token bucket limiter; acquire() waits until a token is available"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.throttled = 0
+        self.throttled_at: Optional[float] = None
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+
+            self.throttled += 1
+            self.throttled_at = now
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class CircuitBreaker:
+    """
+    Closed: calls pass. Open: calls fail fast until the cool-down ends.
+    Half-open: one trial call decides whether to close or reopen.
+    """
+
+    def __init__(self):
+        self.consecutive_failures = 0
+        self.retries = 0
+        self.opened_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < BREAKER_COOLDOWN_SECONDS:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.last_error = None
+        self._trial_in_flight = False
+
+    def release_trial(self):
+        """Let another call be the trial after one ended without an outcome (e.g. cancelled)"""
+        self._trial_in_flight = False
+
+    def record_failure(self, error: Exception):
+        self.consecutive_failures += 1
+        self.last_error = str(error)
+        if self._trial_in_flight or self.consecutive_failures >= BREAKER_FAILURE_THRESHOLD:
+            self.opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+
+_buckets: Dict[Tuple[str, str], TokenBucket] = {}
+_breakers: Dict[Tuple[str, str, str], CircuitBreaker] = {}
+
+
+def is_retryable(error: Exception) -> bool:
+    """Quota, throttling and transient server errors are worth retrying"""
+    # Client libraries are imported lazily by the monitors; an error can
+    # only come from one that is already loaded
+    google_exceptions = sys.modules.get("google.api_core.exceptions")
+    if google_exceptions is not None:
+        if isinstance(error, tuple(getattr(google_exceptions, name) for name in _RETRYABLE_GOOGLE_ERRORS)):
+            return True
+
+    kubernetes_exceptions = sys.modules.get("kubernetes.client.exceptions")
+    if kubernetes_exceptions is not None and isinstance(error, kubernetes_exceptions.ApiException):
+        return error.status in _RETRYABLE_HTTP_STATUSES
+
+    return False
+
+
+def check_circuit(api: str, project_id: str, target: Optional[str] = None):
+    """Raise CircuitOpenError if calls to a target are currently suspended"""
+    breaker = _breakers.get((api, project_id, target or ""))
+    if breaker is not None and breaker.state == "open":
+        raise CircuitOpenError(
+            f"{api} calls for {target or project_id} are suspended after repeated failures: {breaker.last_error}"
+        )
+
+
+async def call_api(api: str, project_id: str, fn: Callable, *args,
+                   target: Optional[str] = None, materialize: bool = False, **kwargs):
+    """
+    Run a blocking GCP/Kubernetes client call in a worker thread with
+    per-(API, project) rate limiting, jittered exponential backoff on
+    retryable errors, and a circuit breaker per (API, project, target).
+    With materialize=True a paged result is read completely in the thread.
+    Every attempt is archived when recording, or answered from the archive
+    when replaying.
+    """
+    breaker_key = (api, project_id, target or "")
+    breaker = _breakers.get(breaker_key)
+    if breaker is None:
+        breaker = _breakers[breaker_key] = CircuitBreaker()
+
+    is_trial = breaker.state == "half_open"
+    if not breaker.allow():
+        raise CircuitOpenError(
+            f"{api} calls for {target or project_id} are suspended after repeated failures: {breaker.last_error}"
+        )
+
+    bucket = _buckets.get((api, project_id))
+    if bucket is None:
+        bucket = _buckets[(api, project_id)] = TokenBucket(CALL_RATE_PER_SECOND)
+
+    call_key = (api, project_id, target or "", getattr(fn, "__name__", repr(fn)))
+
+    def invoke():
+        started = time.monotonic()
+        try:
+            result = fn(*args, **kwargs)
+            result = list(result) if materialize else result
+        except Exception as e:
+            if recorder is not None:
+                recorder.record(call_key, started, time.monotonic() - started, error=e)
+            raise
+
+        if recorder is not None:
+            recorder.record(call_key, started, time.monotonic() - started, result=result)
+        return result
+
+    counter = call_counter.get()
+
+    try:
+        for attempt in range(1, CALL_MAX_ATTEMPTS + 1):
+            await bucket.acquire()
+            if counter is not None:
+                counter.count += 1
+
+            try:
+                if replayer is not None:
+                    result = await replayer.replay(call_key)
+                else:
+                    result = await asyncio.to_thread(invoke)
+            except Exception as e:
+                if is_retryable(e) and attempt < CALL_MAX_ATTEMPTS:
+                    breaker.retries += 1
+                    delay = min(CALL_BACKOFF_MAX_SECONDS, CALL_BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
+                    await asyncio.sleep(random.uniform(0, delay))
+                    continue
+
+                breaker.record_failure(e)
+                raise
+
+            breaker.record_success()
+            return result
+    finally:
+        # A cancelled trial records neither outcome and would keep the circuit half-open
+        if is_trial:
+            breaker.release_trial()
+
+
+def api_health() -> List[ApiHealthMetric]:
+    """Targets that are failing, suspended or being throttled"""
+    results = []
+
+    for (api, project_id, target), breaker in _breakers.items():
+        bucket = _buckets.get((api, project_id))
+        throttled = bucket.throttled if bucket else 0
+        state = breaker.state
+
+        if state == "closed" and not breaker.consecutive_failures:
+            continue
+
+        results.append(ApiHealthMetric(
+            api=api,
+            project_id=project_id,
+            target=target or "-",
+            state=state,
+            consecutive_failures=breaker.consecutive_failures,
+            retries=breaker.retries,
+            throttled_calls=throttled,
+            last_error=breaker.last_error,
+            status=StatusType.RED if state == "open" else StatusType.YELLOW
+        ))
+
+    # The limiter is shared by every target of an API in a project, so one row
+    # per (API, project) shows throttling even while all its circuits are closed
+    now = time.monotonic()
+    for (api, project_id), bucket in _buckets.items():
+        if bucket.throttled_at is None or now - bucket.throttled_at > THROTTLE_REPORT_SECONDS:
+            continue
+
+        results.append(ApiHealthMetric(
+            api=api,
+            project_id=project_id,
+            target="*",
+            state="closed",
+            consecutive_failures=0,
+            retries=0,
+            throttled_calls=bucket.throttled,
+            last_error=f"Rate limited to {bucket.rate:g} calls per second",
+            status=StatusType.YELLOW
+        ))
+
+    return results
@@ -0,0 +1,146 @@
+from kubernetes import client, config as k8s_config
+from google.cloud import container_v1
+from typing import Dict, List, Optional, Tuple
+from ..config import GKEClusterConfig
+from .gcp_calls import CircuitOpenError, call_api, check_circuit
+from functools import lru_cache
+import asyncio
+import calendar
+import json
+import time
+
+# Pod/node listings are shared by every monitor that scrapes the same cluster
+# within this many seconds, so one scrape costs a single list call per kind
+SNAPSHOT_TTL_SECONDS = 30
+
+# Fail fast on unreachable cluster endpoints instead of waiting on the socket
+KUBERNETES_REQUEST_TIMEOUT_SECONDS = 30
+
+_api_clients: Dict[Tuple[str, str, str], client.ApiClient] = {}
+_snapshots: Dict[Tuple[str, str, str, str], Tuple[float, List[dict]]] = {}
+_snapshot_locks: Dict[Tuple[str, str, str, str], asyncio.Lock] = {}
+
+
+@lru_cache(maxsize=4096)
+def parse_timestamp(value: Optional[str]) -> Optional[float]:
+    """Seconds since the epoch for an RFC 3339 UTC timestamp"""
+    if not value:
+        return None
+    # Event storms repeat the same second many times; strptime is too slow there
+    return calendar.timegm((
+        int(value[0:4]), int(value[5:7]), int(value[8:10]),
+        int(value[11:13]), int(value[14:16]), int(value[17:19])
+    ))
+
+
+async def get_gke_credentials(project_id: str, cluster_name: str, location: str):
+    """Get GKE cluster credentials"""
+    container_client = container_v1.ClusterManagerClient()
+
+    cluster_path = f"projects/{project_id}/locations/{location}/clusters/{cluster_name}"
+    cluster = await call_api("container", project_id, container_client.get_cluster, name=cluster_path, target=cluster_name)
+
+    # Create kubeconfig
+    kubeconfig = {
+        "apiVersion": "v1",
+        "kind": "Config",
+        "clusters": [{
+            "name": cluster_name,
+            "cluster": {
+                "certificate-authority-data": cluster.master_auth.cluster_ca_certificate,
+                "server": f"https://{cluster.endpoint}"
+            }
+        }],
+        "contexts": [{
+            "name": cluster_name,
+            "context": {
+                "cluster": cluster_name,
+                "user": cluster_name
+            }
+        }],
+        "current-context": cluster_name,
+        "users": [{
+            "name": cluster_name,
+            "user": {
+                "exec": {
+                    "apiVersion": "client.authentication.k8s.io/v1beta1",
+                    "command": "gcloud",
+                    "args": [
+                        "config",
+                        "config-helper",
+                        "--format=json"
+                    ],
+                    "interactiveMode": "Never"
+                }
+            }
+        }]
+    }
+
+    return kubeconfig
+
+
+async def get_api_client(project_id: str, cluster_config: GKEClusterConfig) -> client.ApiClient:
+    """Return a Kubernetes API client for a cluster, reused across scrapes"""
+    key = (project_id, cluster_config.location, cluster_config.name)
+
+    api_client = _api_clients.get(key)
+    if api_client is None:
+        kubeconfig = await get_gke_credentials(project_id, cluster_config.name, cluster_config.location)
+        api_client = k8s_config.new_client_from_config_dict(config_dict=kubeconfig)
+        _api_clients[key] = api_client
+
+    return api_client
+
+
+def _list_items(list_fn) -> List[dict]:
+    # Skip model deserialization; plain dicts are much cheaper for large clusters
+    response = list_fn(watch=False, _preload_content=False, _request_timeout=KUBERNETES_REQUEST_TIMEOUT_SECONDS)
+    return json.loads(response.data).get("items", [])
+
+
+def list_pods(v1: client.CoreV1Api) -> List[dict]:
+    return _list_items(v1.list_pod_for_all_namespaces)
+
+
+def list_nodes(v1: client.CoreV1Api) -> List[dict]:
+    return _list_items(v1.list_node)
+
+
+async def _list_cluster_objects(project_id: str, cluster_config: GKEClusterConfig, kind: str) -> List[dict]:
+    key = (project_id, cluster_config.location, cluster_config.name, kind)
+
+    # Monitors scraping the same cluster concurrently wait for one listing
+    lock = _snapshot_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        cached = _snapshots.get(key)
+        if cached and time.monotonic() - cached[0] < SNAPSHOT_TTL_SECONDS:
+            return cached[1]
+
+        # A suspended cluster fails fast, without fetching credentials for a new client
+        check_circuit("kubernetes", project_id, cluster_config.name)
+
+        v1 = client.CoreV1Api(await get_api_client(project_id, cluster_config))
+        list_fn = list_pods if kind == "pods" else list_nodes
+
+        try:
+            items = await call_api("kubernetes", project_id, list_fn, v1, target=cluster_config.name)
+        except CircuitOpenError:
+            raise
+        except Exception:
+            # Drop the connection so the next scrape fetches fresh credentials
+            _api_clients.pop(key[:3], None)
+            raise
+
+        _snapshots[key] = (time.monotonic(), items)
+
+        return items
+
+
+async def list_cluster_pods(project_id: str, cluster_config: GKEClusterConfig) -> List[dict]:
+    """List all pods in a cluster as raw API dicts"""
+    return await _list_cluster_objects(project_id, cluster_config, "pods")
+
+
+async def list_cluster_nodes(project_id: str, cluster_config: GKEClusterConfig) -> List[dict]:
+    """List all nodes in a cluster as raw API dicts"""
+    return await _list_cluster_objects(project_id, cluster_config, "nodes")
@@ -1,20 +1,62 @@
-from google.cloud import container_v1
-from typing import List
+from google.cloud import compute_v1, container_v1
+from typing import Dict, List
 from ..models.monitoring import NodePoolMetric, StatusType
 from ..config import GKEClusterConfig
+from .gcp_calls import call_api
+from .thresholds import get_evaluator
+
+
+def _instance_group_key(url: str) -> str:
+    """Normalize an instance group (manager) URL to "<zone>/<name>"."""
+    parts = url.rstrip('/').split('/')
+    return f"{parts[-3]}/{parts[-1]}"
+
+
+async def fetch_instance_group_sizes(project_id: str) -> Dict[str, int]:
+    """
+    Fetch the target size of every managed instance group in a project with a
+    single aggregated call, keyed by "<zone>/<name>".
+    """
+    igm_client = compute_v1.InstanceGroupManagersClient()
+
+    request = compute_v1.AggregatedListInstanceGroupManagersRequest(
+        project=project_id,
+        return_partial_success=True
+    )
+
+    scoped_lists = await call_api("compute", project_id, igm_client.aggregated_list, request=request, materialize=True)
+
+    sizes = {}
+    for _, scoped_list in scoped_lists:
+        for manager in scoped_list.instance_group_managers:
+            sizes[_instance_group_key(manager.self_link)] = manager.target_size
+
+    return sizes
 
 
 async def monitor_gke_nodes(project_id: str, clusters: List[GKEClusterConfig]) -> List[NodePoolMetric]:
     """Monitor GKE node pools and report those at 80%+ capacity"""
     results = []
+    evaluator = get_evaluator(project_id)
 
     try:
         container_client = container_v1.ClusterManagerClient()
 
+        # Current pool sizes come from the pools' managed instance groups,
+        # fetched once for the whole project instead of once per pool
+        try:
+            instance_group_sizes = await fetch_instance_group_sizes(project_id)
+        except Exception as e:
+            print(f"Error fetching instance group sizes for project {project_id}: {str(e)}")
+            instance_group_sizes = {}
+
         for cluster_config in clusters:
             try:
                 cluster_path = f"projects/{project_id}/locations/{cluster_config.location}/clusters/{cluster_config.name}"
-                cluster = container_client.get_cluster(name=cluster_path)
+                cluster = await call_api(
+                    "container", project_id, container_client.get_cluster,
+                    name=cluster_path, target=cluster_config.name
+                )
 
                 is_regional = cluster_config.type.lower() == "regional"
 
@@ -24,16 +66,20 @@ async def monitor_gke_nodes(project_id: str, clusters: List[GKEClusterConfig]) -
                         # Skip non-autoscaling pools
                         continue
 
-                    current_node_count = node_pool.initial_node_count
-                    max_nodes = node_pool.autoscaling.max_node_count
+                    # Autoscaling limits are per zone, so scale by the zones the pool runs in
+                    zone_count = len(node_pool.locations) or len(cluster.locations) or 1
 
-                    # For regional clusters, multiply by 3 (one per zone)
-                    if is_regional:
-                        effective_max = max_nodes * 3
-                        effective_current = current_node_count * 3
+                    if node_pool.autoscaling.total_max_node_count:
+                        effective_max = node_pool.autoscaling.total_max_node_count
                     else:
-                        effective_max = max_nodes
-                        effective_current = current_node_count
+                        effective_max = node_pool.autoscaling.max_node_count * zone_count
+
+                    group_keys = [_instance_group_key(url) for url in node_pool.instance_group_urls]
+                    if group_keys and all(key in instance_group_sizes for key in group_keys):
+                        effective_current = sum(instance_group_sizes[key] for key in group_keys)
+                    else:
+                        # Fall back to the creation-time size when the groups are not visible
+                        effective_current = node_pool.initial_node_count * zone_count
 
                     # Calculate utilization percentage
                     if effective_max > 0:
@@ -41,15 +87,9 @@ async def monitor_gke_nodes(project_id: str, clusters: List[GKEClusterConfig]) -
                     else:
                         utilization = 0
 
-                    # Only report if at 80% or higher
-                    if utilization >= 80:
-                        if utilization >= 95:
-                            status_icon = StatusType.RED
-                        elif utilization >= 90:
-                            status_icon = StatusType.YELLOW
-                        else:
-                            status_icon = StatusType.YELLOW
-
+                    # Only report if at the warning threshold (80% by default) or higher
+                    status_icon = evaluator.classify("node_pools", f"{cluster_config.name}/{node_pool.name}", utilization)
+                    if status_icon:
                         results.append(NodePoolMetric(
                             project_id=project_id,
                             cluster_name=cluster_config.name,
@@ -0,0 +1,324 @@
+from kubernetes import client
+from kubernetes.watch.watch import iter_resp_lines
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from ..models.monitoring import K8sEventMetric, StatusType
+from ..config import GKEClusterConfig
+from .gke_client import get_api_client, parse_timestamp
+from .recording import replayer
+from .thresholds import get_evaluator
+import asyncio
+import json
+import threading
+import time
+
+# One hour of history in one-minute buckets
+BUCKET_SECONDS = 60
+BUCKET_COUNT = 60
+
+# Distinct (reason, namespace, object) keys kept per bucket; a bucket may grow
+# to twice this before its rarest keys are dropped
+MAX_KEYS_PER_BUCKET = 256
+
+# Event UIDs remembered to turn repeated-event count updates into deltas
+MAX_TRACKED_EVENTS = 20000
+
+# Windows reported per offender; the short one drives the status
+RECENT_WINDOW_MINUTES = 10
+TOP_OFFENDERS_PER_CLUSTER = 10
+
+# Watchers of clusters no longer scraped stop after this long
+WATCHER_IDLE_SECONDS = 1800
+WATCH_TIMEOUT_SECONDS = 300
+
+# A new watcher's first scrape waits this long for the initial event list
+INITIAL_LIST_TIMEOUT_SECONDS = 30
+
+EventKey = Tuple[str, str, str, str]  # reason, namespace, involved kind, involved name
+
+
+class EventAggregator:
+    """
+    Warning event counts per (reason, namespace, involved object) in a fixed
+    ring of time buckets. Memory stays bounded during event storms: each
+    bucket holds at most 2 * MAX_KEYS_PER_BUCKET keys and at most
+    MAX_TRACKED_EVENTS event UIDs are remembered.
+    """
+
+    def __init__(self, bucket_seconds: int = BUCKET_SECONDS, bucket_count: int = BUCKET_COUNT,
+                 max_keys: int = MAX_KEYS_PER_BUCKET, max_tracked_events: int = MAX_TRACKED_EVENTS):
+        self.bucket_seconds = bucket_seconds
+        self.bucket_count = bucket_count
+        self.max_keys = max_keys
+        self.max_tracked_events = max_tracked_events
+        self._epochs = [-1] * bucket_count
+        self._buckets: List[Dict[EventKey, int]] = [{} for _ in range(bucket_count)]
+        self._last_counts: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.events_seen = 0
+
+    def record(self, event: dict, now: Optional[float] = None, listed: bool = False):
+        """
+        Count one event object from a list (listed=True) or watch of the
+        Events API. A UID seen before adds the growth of its count. A listed
+        UID not seen before adds its count spread evenly from firstTimestamp
+        to lastTimestamp. An unseen UID from the watch (new, or forgotten
+        during a storm) adds only the occurrence that triggered the update.
+        """
+        if event.get("type") != "Warning":
+            return
+
+        metadata = event.get("metadata") or {}
+        involved = event.get("involvedObject") or {}
+        key = (
+            event.get("reason") or "Unknown",
+            involved.get("namespace") or metadata.get("namespace") or "",
+            involved.get("kind") or "",
+            involved.get("name") or "",
+        )
+
+        # Repeated events are updated in place with a higher count
+        count = (event.get("series") or {}).get("count") or event.get("count") or 1
+        uid = metadata.get("uid", "")
+
+        with self._lock:
+            previous = self._last_counts.pop(uid, None)
+            self._last_counts[uid] = count
+            if len(self._last_counts) > self.max_tracked_events:
+                self._last_counts.popitem(last=False)
+
+            now = now or time.time()
+            timestamp = parse_timestamp(event.get("lastTimestamp") or event.get("eventTime")) or now
+
+            if previous is not None:
+                if count <= previous:
+                    return
+                self._add(key, count - previous, timestamp, now)
+            elif listed:
+                first = parse_timestamp(event.get("firstTimestamp")) or timestamp
+                self._spread(key, count, first, timestamp, now)
+            else:
+                self._add(key, 1, timestamp, now)
+
+            self.events_seen += 1
+
+    def _spread(self, key: EventKey, count: int, first: float, last: float, now: float):
+        """Add `count` occurrences evenly between first and last, dropping those before the oldest bucket"""
+        if last <= first:
+            self._add(key, count, last, now)
+            return
+
+        rate = count / (last - first)
+        start = max(first, (int(now // self.bucket_seconds) - self.bucket_count + 1) * self.bucket_seconds)
+
+        # Rounding the running total keeps the per-bucket counts whole and summing up exactly
+        while start < last:
+            end = min(last, (int(start // self.bucket_seconds) + 1) * self.bucket_seconds)
+            occurrences = round(rate * (end - first)) - round(rate * (start - first))
+            if occurrences:
+                self._add(key, occurrences, start, now)
+            start = end
+
+    def _add(self, key: EventKey, delta: int, timestamp: float, now: float):
+        epoch = int(timestamp // self.bucket_seconds)
+        if epoch <= int(now // self.bucket_seconds) - self.bucket_count:
+            return
+
+        slot = epoch % self.bucket_count
+        if self._epochs[slot] != epoch:
+            if self._epochs[slot] > epoch:
+                return
+            self._epochs[slot] = epoch
+            self._buckets[slot] = {}
+
+        bucket = self._buckets[slot]
+        bucket[key] = bucket.get(key, 0) + delta
+
+        # Prune back to the top keys once a bucket doubles, so the long tail
+        # of a storm costs amortized O(log n) per event instead of a scan
+        if len(bucket) > 2 * self.max_keys:
+            top = sorted(bucket.items(), key=lambda item: item[1], reverse=True)[:self.max_keys]
+            self._buckets[slot] = dict(top)
+
+    def window_counts(self, minutes: int, now: Optional[float] = None) -> Dict[EventKey, int]:
+        """Counts per key over the last `minutes` minutes"""
+        current_epoch = int((now or time.time()) // self.bucket_seconds)
+        oldest_epoch = current_epoch - (minutes * 60) // self.bucket_seconds
+
+        totals: Dict[EventKey, int] = {}
+        with self._lock:
+            for epoch, bucket in zip(self._epochs, self._buckets):
+                if oldest_epoch < epoch <= current_epoch:
+                    for key, count in bucket.items():
+                        totals[key] = totals.get(key, 0) + count
+
+        return totals
+
+    def size(self) -> int:
+        """Number of keys currently held across all buckets"""
+        return sum(len(bucket) for bucket in self._buckets)
+
+
+class ClusterEventWatcher:
+    """Background thread listing and then watching a cluster's events"""
+
+    def __init__(self, api_client: client.ApiClient, aggregator: Optional[EventAggregator] = None):
+        self.api_client = api_client
+        self.v1 = client.CoreV1Api(api_client)
+        self.aggregator = aggregator or EventAggregator()
+        self.last_error: Optional[str] = None
+        self.last_requested = time.monotonic()
+        self.listed = threading.Event()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _list(self) -> str:
+        response = self.v1.list_event_for_all_namespaces(_preload_content=False, _request_timeout=60)
+        listing = json.loads(response.data)
+        for event in listing.get("items", []):
+            self.aggregator.record(event, listed=True)
+        return listing["metadata"]["resourceVersion"]
+
+    def _watch(self, resource_version: str) -> Optional[str]:
+        response = self.v1.list_event_for_all_namespaces(
+            watch=True,
+            resource_version=resource_version,
+            timeout_seconds=WATCH_TIMEOUT_SECONDS,
+            # A connection dropped without a FIN would otherwise block forever
+            _request_timeout=WATCH_TIMEOUT_SECONDS + 30,
+            _preload_content=False
+        )
+        try:
+            for line in iter_resp_lines(response):
+                if self.stopped.is_set():
+                    break
+
+                change = json.loads(line)
+                event = change.get("object") or {}
+
+                if change.get("type") == "ERROR":
+                    # 410 Gone: the resource version expired, relist
+                    return None
+                if change.get("type") in ("ADDED", "MODIFIED"):
+                    self.aggregator.record(event)
+
+                resource_version = (event.get("metadata") or {}).get("resourceVersion", resource_version)
+        finally:
+            response.release_conn()
+
+        return resource_version
+
+    def stop(self):
+        """Stop once the current list or watch request returns"""
+        self.stopped.set()
+
+    def _run(self):
+        resource_version = None
+        backoff = 1
+
+        while not self.stopped.is_set() and time.monotonic() - self.last_requested < WATCHER_IDLE_SECONDS:
+            try:
+                if resource_version is None:
+                    resource_version = self._list()
+                    self.listed.set()
+                    self.last_error = None
+                resource_version = self._watch(resource_version)
+                self.last_error = None
+                backoff = 1
+            except Exception as e:
+                self.last_error = str(e)
+                resource_version = None
+                self.stopped.wait(backoff)
+                backoff = min(60, backoff * 2)
+
+
+_watchers: Dict[Tuple[str, str, str], ClusterEventWatcher] = {}
+
+
+async def get_event_watcher(project_id: str, cluster_config: GKEClusterConfig) -> ClusterEventWatcher:
+    """Start (or reuse) the event watcher of a cluster, on the shared cluster client"""
+    key = (project_id, cluster_config.location, cluster_config.name)
+
+    api_client = await get_api_client(project_id, cluster_config)
+
+    # A cluster client replaced after failures (e.g. expired credentials) gets
+    # a new watcher; the counts collected so far carry over
+    watcher = _watchers.get(key)
+    if watcher is None or not watcher.thread.is_alive() or watcher.api_client is not api_client:
+        if watcher is not None:
+            watcher.stop()
+        watcher = _watchers[key] = ClusterEventWatcher(
+            api_client, watcher.aggregator if watcher is not None else None
+        )
+
+    watcher.last_requested = time.monotonic()
+    return watcher
+
+
+async def monitor_k8s_events(project_id: str, clusters: List[GKEClusterConfig]) -> List[K8sEventMetric]:
+    """Report the top Warning event offenders per cluster over the last 10 and 60 minutes"""
+    results = []
+    evaluator = get_evaluator(project_id)
+
+    # Event streams are not part of recordings; replays never watch live clusters
+    if replayer is not None:
+        return results
+
+    for cluster_config in clusters:
+        try:
+            watcher = await get_event_watcher(project_id, cluster_config)
+            aggregator = watcher.aggregator
+
+            # Without the initial list a new watcher has nothing to report yet,
+            # which would read as a quiet cluster (and always does for the CLI)
+            if not watcher.listed.is_set():
+                await asyncio.to_thread(watcher.listed.wait, INITIAL_LIST_TIMEOUT_SECONDS)
+                if not watcher.listed.is_set():
+                    raise RuntimeError(watcher.last_error or "Timed out listing events")
+
+            recent = aggregator.window_counts(RECENT_WINDOW_MINUTES)
+            hourly = aggregator.window_counts(BUCKET_COUNT * BUCKET_SECONDS // 60)
+
+            offenders = sorted(recent, key=lambda key: (recent[key], hourly.get(key, 0)), reverse=True)
+            offenders = offenders[:TOP_OFFENDERS_PER_CLUSTER]
+
+            # Thresholds are resolved per event reason
+            statuses = evaluator.classify_rows(
+                "k8s_events",
+                [reason for reason, _, _, _ in offenders],
+                [recent[key] for key in offenders]
+            )
+
+            for (reason, namespace, kind, name), status_icon in zip(offenders, statuses):
+                if status_icon:
+                    results.append(K8sEventMetric(
+                        project_id=project_id,
+                        cluster_name=cluster_config.name,
+                        reason=reason,
+                        namespace=namespace,
+                        object_kind=kind,
+                        object_name=name,
+                        count_10m=recent[(reason, namespace, kind, name)],
+                        count_60m=hourly.get((reason, namespace, kind, name), 0),
+                        status=status_icon
+                    ))
+
+            # Counts stop growing while the watch fails; report that next to them
+            if watcher.last_error:
+                raise RuntimeError(f"Event watch failing: {watcher.last_error}")
+
+        except Exception as e:
+            results.append(K8sEventMetric(
+                project_id=project_id,
+                cluster_name=cluster_config.name,
+                reason=f"Error: {str(e)}",
+                namespace="error",
+                object_kind="error",
+                object_name="error",
+                count_10m=0,
+                count_60m=0,
+                status=StatusType.RED
+            ))
+
+    return results
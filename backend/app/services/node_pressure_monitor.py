@@ -0,0 +1,160 @@
+from functools import lru_cache
+from typing import Dict, List, Tuple
+from ..models.monitoring import NodePressureMetric, StatusType
+from ..config import GKEClusterConfig
+from .gke_client import list_cluster_nodes, list_cluster_pods
+from .thresholds import get_evaluator
+
+NODE_POOL_LABEL = "cloud.google.com/gke-nodepool"
+
+# A node at or above this share of allocatable CPU or memory is saturated
+NODE_SATURATION_PERCENT = 90
+
+_QUANTITY_SUFFIXES = {
+    "m": 1e-3,
+    "k": 1e3, "M": 1e6, "G": 1e9, "T": 1e12, "P": 1e15, "E": 1e18,
+    "Ki": 2 ** 10, "Mi": 2 ** 20, "Gi": 2 ** 30, "Ti": 2 ** 40, "Pi": 2 ** 50, "Ei": 2 ** 60,
+}
+
+
+@lru_cache(maxsize=4096)
+def parse_quantity(quantity: str) -> float:
+    """Parse a Kubernetes resource quantity ("250m", "1Gi", "2") into a float"""
+    for suffix_length in (2, 1):
+        multiplier = _QUANTITY_SUFFIXES.get(quantity[-suffix_length:])
+        if multiplier is not None:
+            return float(quantity[:-suffix_length]) * multiplier
+    return float(quantity)
+
+
+def _pod_requests(pod: dict) -> Tuple[float, float]:
+    """Effective CPU (cores) and memory (bytes) requests of a pod"""
+    spec = pod.get("spec", {})
+    cpu = memory = 0.0
+
+    for container in spec.get("containers") or []:
+        requests = (container.get("resources") or {}).get("requests") or {}
+        if "cpu" in requests:
+            cpu += parse_quantity(requests["cpu"])
+        if "memory" in requests:
+            memory += parse_quantity(requests["memory"])
+
+    # Init containers run one at a time, so only the largest one can exceed the sum
+    for container in spec.get("initContainers") or []:
+        requests = (container.get("resources") or {}).get("requests") or {}
+        if "cpu" in requests:
+            cpu = max(cpu, parse_quantity(requests["cpu"]))
+        if "memory" in requests:
+            memory = max(memory, parse_quantity(requests["memory"]))
+
+    return cpu, memory
+
+
+def aggregate_node_pressure(nodes: List[dict], pods: List[dict]) -> Dict[str, dict]:
+    """
+    Aggregate requested versus allocatable CPU and memory per node pool in a
+    single pass over nodes and pods.
+    """
+    # Per node: [pool, allocatable cpu, allocatable memory, requested cpu, requested memory]
+    node_usage = {}
+    for node in nodes:
+        metadata = node.get("metadata", {})
+        allocatable = node.get("status", {}).get("allocatable") or {}
+        node_usage[metadata.get("name")] = [
+            (metadata.get("labels") or {}).get(NODE_POOL_LABEL, "unknown"),
+            parse_quantity(allocatable.get("cpu", "0")),
+            parse_quantity(allocatable.get("memory", "0")),
+            0.0,
+            0.0,
+        ]
+
+    for pod in pods:
+        usage = node_usage.get(pod.get("spec", {}).get("nodeName"))
+        if usage is None:
+            continue
+
+        # Completed pods no longer hold their requests
+        if pod.get("status", {}).get("phase") in ("Succeeded", "Failed"):
+            continue
+
+        cpu, memory = _pod_requests(pod)
+        usage[3] += cpu
+        usage[4] += memory
+
+    pools = {}
+    for node_name, (pool_name, cpu_allocatable, memory_allocatable, cpu_requested, memory_requested) in node_usage.items():
+        pool = pools.get(pool_name)
+        if pool is None:
+            pool = pools[pool_name] = {
+                "node_count": 0,
+                "saturated_nodes": 0,
+                "cpu_allocatable": 0.0,
+                "memory_allocatable": 0.0,
+                "cpu_requested": 0.0,
+                "memory_requested": 0.0,
+                "max_node_cpu_percent": 0.0,
+                "max_node_memory_percent": 0.0,
+            }
+
+        cpu_percent = (cpu_requested / cpu_allocatable) * 100 if cpu_allocatable else 0.0
+        memory_percent = (memory_requested / memory_allocatable) * 100 if memory_allocatable else 0.0
+
+        pool["node_count"] += 1
+        pool["cpu_allocatable"] += cpu_allocatable
+        pool["memory_allocatable"] += memory_allocatable
+        pool["cpu_requested"] += cpu_requested
+        pool["memory_requested"] += memory_requested
+        pool["max_node_cpu_percent"] = max(pool["max_node_cpu_percent"], cpu_percent)
+        pool["max_node_memory_percent"] = max(pool["max_node_memory_percent"], memory_percent)
+        if cpu_percent >= NODE_SATURATION_PERCENT or memory_percent >= NODE_SATURATION_PERCENT:
+            pool["saturated_nodes"] += 1
+
+    return pools
+
+
+async def monitor_node_pressure(project_id: str, clusters: List[GKEClusterConfig]) -> List[NodePressureMetric]:
+    """Monitor requested CPU/memory against allocatable per node pool and report pools at 80%+"""
+    results = []
+    evaluator = get_evaluator(project_id)
+
+    for cluster_config in clusters:
+        try:
+            nodes = await list_cluster_nodes(project_id, cluster_config)
+            pods = await list_cluster_pods(project_id, cluster_config)
+
+            for pool_name, pool in aggregate_node_pressure(nodes, pods).items():
+                cpu_percent = (pool["cpu_requested"] / pool["cpu_allocatable"]) * 100 if pool["cpu_allocatable"] else 0.0
+                memory_percent = (pool["memory_requested"] / pool["memory_allocatable"]) * 100 if pool["memory_allocatable"] else 0.0
+                pressure = max(cpu_percent, memory_percent)
+
+                # Only report if at the warning threshold (80% by default) or higher
+                status_icon = evaluator.classify("node_pressure", f"{cluster_config.name}/{pool_name}", pressure)
+                if status_icon:
+                    results.append(NodePressureMetric(
+                        project_id=project_id,
+                        cluster_name=cluster_config.name,
+                        node_pool_name=pool_name,
+                        node_count=pool["node_count"],
+                        saturated_nodes=pool["saturated_nodes"],
+                        cpu_requested_percent=round(cpu_percent, 2),
+                        memory_requested_percent=round(memory_percent, 2),
+                        max_node_cpu_percent=round(pool["max_node_cpu_percent"], 2),
+                        max_node_memory_percent=round(pool["max_node_memory_percent"], 2),
+                        status=status_icon
+                    ))
+
+        except Exception as e:
+            results.append(NodePressureMetric(
+                project_id=project_id,
+                cluster_name=cluster_config.name,
+                node_pool_name="error",
+                node_count=0,
+                saturated_nodes=0,
+                cpu_requested_percent=0.0,
+                memory_requested_percent=0.0,
+                max_node_cpu_percent=0.0,
+                max_node_memory_percent=0.0,
+                status=StatusType.RED
+            ))
+
+    return results
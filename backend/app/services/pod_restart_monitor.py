@@ -1,117 +1,195 @@
-from kubernetes import client, config as k8s_config
-from google.cloud import container_v1
-from typing import List
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
 from ..models.monitoring import PodRestartMetric, StatusType
 from ..config import GKEClusterConfig
-import tempfile
-import os
-
-
-def get_gke_credentials(project_id: str, cluster_name: str, location: str):
-    """Get GKE cluster credentials"""
-    container_client = container_v1.ClusterManagerClient()
-
-    cluster_path = f"projects/{project_id}/locations/{location}/clusters/{cluster_name}"
-    cluster = container_client.get_cluster(name=cluster_path)
-
-    # Create kubeconfig
-    kubeconfig = {
-        "apiVersion": "v1",
-        "kind": "Config",
-        "clusters": [{
-            "name": cluster_name,
-            "cluster": {
-                "certificate-authority-data": cluster.master_auth.cluster_ca_certificate,
-                "server": f"https://{cluster.endpoint}"
-            }
-        }],
-        "contexts": [{
-            "name": cluster_name,
-            "context": {
-                "cluster": cluster_name,
-                "user": cluster_name
-            }
-        }],
-        "current-context": cluster_name,
-        "users": [{
-            "name": cluster_name,
-            "user": {
-                "exec": {
-                    "apiVersion": "client.authentication.k8s.io/v1beta1",
-                    "command": "gcloud",
-                    "args": [
-                        "config",
-                        "config-helper",
-                        "--format=json"
-                    ],
-                    "interactiveMode": "Never"
-                }
-            }
-        }]
-    }
-
-    return kubeconfig
+from .gke_client import list_cluster_pods, parse_timestamp
+from .thresholds import get_evaluator
+import time
+
+# Restart counters are sampled at most once per SAMPLE_SECONDS; one hour of
+# history plus the current sample
+SAMPLE_SECONDS = 120
+SAMPLE_COUNT = 31
+
+# Windows reported per pod; the last one drives the status
+WINDOWS_MINUTES = (10, 60)
+
+
+class RestartHistory:
+    """
+    Sampled restart counters of every pod of a cluster. Each sample is one
+    array of 16-bit counters indexed by a row per pod UID; windowed restarts
+    are differences modulo 2**16, so wrapped counters still subtract
+    correctly. Rows of deleted pods are freed on the next update and reused.
+    """
+
+    def __init__(self, sample_seconds: int = SAMPLE_SECONDS, sample_count: int = SAMPLE_COUNT):
+        self.sample_seconds = sample_seconds
+        self.sample_count = sample_count
+        self._times = [-1.0] * sample_count
+        self._columns = [array("H") for _ in range(sample_count)]
+        self._rows: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._capacity = 0
+
+    def _grow(self):
+        extra = max(1024, self._capacity)
+        for column in self._columns:
+            column.extend(array("H", bytes(2 * extra)))
+        self._free.extend(range(self._capacity + extra - 1, self._capacity - 1, -1))
+        self._capacity += extra
+
+    def _allocate(self, count: int, created: Optional[str]) -> int:
+        if not self._free:
+            self._grow()
+        row = self._free.pop()
+
+        # Samples taken before the pod existed count from zero, so restarts
+        # of pods created between scrapes still land in the windows
+        created_at = parse_timestamp(created) or 0
+        for sampled_at, column in zip(self._times, self._columns):
+            column[row] = 0 if 0 <= sampled_at < created_at else count
+
+        return row
+
+    def _baseline(self, epoch: int, minutes: int) -> Tuple[array, bool]:
+        """
+        The oldest sample inside the window, or the current one if there is
+        none yet, and whether it covers the whole window (one missed sample
+        at the start is tolerated)
+        """
+        target = epoch - (minutes * 60 + self.sample_seconds - 1) // self.sample_seconds
+        best_epoch, best = epoch, self._columns[epoch % self.sample_count]
+
+        for sampled_at, column in zip(self._times, self._columns):
+            sample_epoch = int(sampled_at // self.sample_seconds)
+            if sampled_at >= 0 and target <= sample_epoch < best_epoch:
+                best_epoch, best = sample_epoch, column
+
+        return best, best_epoch <= target + 1
+
+    def update(self, uids: Sequence[str], counts: Sequence[int], created: Sequence[Optional[str]],
+               finished: Optional[Sequence[Sequence[Optional[str]]]] = None,
+               windows: Sequence[int] = WINDOWS_MINUTES, now: Optional[float] = None) -> List[List[int]]:
+        """
+        Record the current counters and return the restarts of each pod per
+        window. Until the history reaches back over a whole window (e.g. on
+        the first scrape after a start), a pod's restarts in it are at least
+        its whole count if it was created inside the window, or else the
+        number of its containers whose last termination (`finished`, one
+        finishedAt per container) falls inside the window.
+        """
+        now = now or time.time()
+        epoch = int(now // self.sample_seconds)
+        slot = epoch % self.sample_count
+        self._times[slot] = now
+
+        current = self._columns[slot]
+        values = [count & 0xFFFF for count in counts]
+        previous_rows, rows, order = self._rows, {}, []
+
+        for uid, value, created_at in zip(uids, values, created):
+            row = previous_rows.pop(uid, None)
+            if row is None:
+                row = self._allocate(value, created_at)
+            rows[uid] = row
+            order.append(row)
+            current[row] = value
+
+        # Whatever was not listed again has been deleted
+        self._free.extend(previous_rows.values())
+        self._rows = rows
+
+        results, created_times, finished_times = [], None, None
+        for minutes in windows:
+            baseline, covered = self._baseline(epoch, minutes)
+            restarts = [(value - baseline[row]) & 0xFFFF for row, value in zip(order, values)]
+
+            # Without a sample from before the window, fall back to what the
+            # pods themselves tell: restarts since creation, or recent exits
+            if not covered:
+                if created_times is None:
+                    created_times = [parse_timestamp(created_at) or 0 for created_at in created]
+                    finished_times = [
+                        [parse_timestamp(finished_at) for finished_at in containers if finished_at]
+                        for containers in finished
+                    ] if finished else [()] * len(restarts)
+
+                start = now - minutes * 60
+                restarts = [
+                    count if created_at >= start
+                    else max(restart, sum(1 for finished_at in exits if finished_at >= start)) if exits
+                    else restart
+                    for restart, count, created_at, exits in zip(restarts, counts, created_times, finished_times)
+                ]
+
+            results.append(restarts)
+
+        return results
+
+    def size(self) -> int:
+        """Number of pods currently tracked"""
+        return len(self._rows)
+
+
+_histories: Dict[Tuple[str, str, str], RestartHistory] = {}
+
+
+def get_restart_history(project_id: str, cluster_config: GKEClusterConfig) -> RestartHistory:
+    key = (project_id, cluster_config.location, cluster_config.name)
+    if key not in _histories:
+        _histories[key] = RestartHistory()
+    return _histories[key]
 
 
 async def monitor_pod_restarts(project_id: str, clusters: List[GKEClusterConfig]) -> List[PodRestartMetric]:
-    """Monitor pod restart counts and report those with >5 restarts"""
+    """Monitor pod restarts over the last 10 and 60 minutes"""
     results = []
+    evaluator = get_evaluator(project_id)
 
     for cluster_config in clusters:
         try:
-            # Get cluster credentials
-            kubeconfig = get_gke_credentials(
-                project_id,
-                cluster_config.name,
-                cluster_config.location
+            # Get all pods across all namespaces
+            pods = await list_cluster_pods(project_id, cluster_config)
+
+            # Sum up restart counts from all containers of each pod
+            restart_counts = [
+                sum(container_status.get("restartCount", 0)
+                    for container_status in pod.get("status", {}).get("containerStatuses") or [])
+                for pod in pods
+            ]
+
+            restarts_10m, restarts_60m = get_restart_history(project_id, cluster_config).update(
+                [pod["metadata"]["uid"] for pod in pods],
+                restart_counts,
+                [pod["metadata"].get("creationTimestamp") for pod in pods],
+                [
+                    [((container_status.get("lastState") or {}).get("terminated") or {}).get("finishedAt")
+                     for container_status in pod.get("status", {}).get("containerStatuses") or []]
+                    for pod in pods
+                ]
             )
 
-            # Create temporary kubeconfig file
-            with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.yaml') as f:
-                import yaml
-                yaml.dump(kubeconfig, f)
-                kubeconfig_path = f.name
-
-            try:
-                # Load the kubeconfig
-                k8s_config.load_kube_config(config_file=kubeconfig_path)
-
-                # Create API client
-                v1 = client.CoreV1Api()
-
-                # Get all pods across all namespaces
-                pods = v1.list_pod_for_all_namespaces(watch=False)
-
-                # Check restart counts
-                for pod in pods.items:
-                    total_restarts = 0
-
-                    # Sum up restart counts from all containers
-                    if pod.status.container_statuses:
-                        for container_status in pod.status.container_statuses:
-                            total_restarts += container_status.restart_count
-
-                    # Report if restarts > 5
-                    if total_restarts > 5:
-                        if total_restarts > 20:
-                            status_icon = StatusType.RED
-                        elif total_restarts > 10:
-                            status_icon = StatusType.YELLOW
-                        else:
-                            status_icon = StatusType.YELLOW
-
-                        results.append(PodRestartMetric(
-                            project_id=project_id,
-                            cluster_name=cluster_config.name,
-                            namespace=pod.metadata.namespace,
-                            pod_name=pod.metadata.name,
-                            restart_count=total_restarts,
-                            status=status_icon
-                        ))
-
-            finally:
-                # Clean up temp file
-                os.unlink(kubeconfig_path)
+            # Thresholds are resolved per namespace (>3 restarts in the last hour by default)
+            statuses = evaluator.classify_rows(
+                "pod_restarts",
+                [pod["metadata"]["namespace"] for pod in pods],
+                restarts_60m
+            )
+
+            for pod, total_restarts, recent, hourly, status_icon in zip(
+                    pods, restart_counts, restarts_10m, restarts_60m, statuses):
+                if status_icon:
+                    results.append(PodRestartMetric(
+                        project_id=project_id,
+                        cluster_name=cluster_config.name,
+                        namespace=pod["metadata"]["namespace"],
+                        pod_name=pod["metadata"]["name"],
+                        restart_count=total_restarts,
+                        restarts_10m=recent,
+                        restarts_60m=hourly,
+                        status=status_icon
+                    ))
 
         except Exception as e:
             results.append(PodRestartMetric(
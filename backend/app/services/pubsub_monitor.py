@@ -1,104 +1,156 @@
-from google.cloud import pubsub_v1, monitoring_v3
-from typing import List
+from google.cloud import monitoring_v3
+from typing import Dict, Iterable, List, Optional, Tuple
 from ..models.monitoring import PubSubMetric, StatusType
-from datetime import datetime, timedelta
+from .gcp_calls import call_api
+from .thresholds import get_evaluator
 import time
 
+# Every metric is fitted over this window of one-minute points
+WINDOW_MINUTES = 10
+
+# Subscriptions are flagged by their oldest unacked age now or, at the
+# current trend, this many minutes from now
+FORECAST_MINUTES = 30
+
+UNDELIVERED_METRIC = "pubsub.googleapis.com/subscription/num_undelivered_messages"
+OLDEST_AGE_METRIC = "pubsub.googleapis.com/subscription/oldest_unacked_message_age"
+ACK_RATE_METRIC = "pubsub.googleapis.com/subscription/ack_message_count"
+
+
+def window_fits(time_series: Iterable, now: float) -> Dict[str, Tuple[float, float, float]]:
+    """
+    Fit a least-squares line to every subscription's window in one pass.
+    Returns (latest value, slope per minute, mean) per subscription id.
+    Time is measured in minutes before `now`, so the sums stay small.
+    """
+    sums: Dict[str, List[float]] = {}
+    latest: Dict[str, Tuple[float, float]] = {}
+
+    for series in time_series:
+        subscription_id = series.resource.labels["subscription_id"]
+        acc = sums.setdefault(subscription_id, [0, 0.0, 0.0, 0.0, 0.0])
+
+        for point in series.points:
+            t = (point.interval.end_time.timestamp() - now) / 60.0
+            y = point.value.double_value or point.value.int64_value
+            acc[0] += 1
+            acc[1] += t
+            acc[2] += y
+            acc[3] += t * t
+            acc[4] += t * y
+
+            if subscription_id not in latest or t > latest[subscription_id][0]:
+                latest[subscription_id] = (t, y)
+
+    fits = {}
+    for subscription_id, (n, st, sy, stt, sty) in sums.items():
+        if not n:
+            continue
+        denominator = n * stt - st * st
+        slope = (n * sty - st * sy) / denominator if denominator else 0.0
+        fits[subscription_id] = (latest[subscription_id][1], slope, sy / n)
+
+    return fits
+
+
+async def query_window(monitoring_client, project_id: str, metric_type: str,
+                       aligner: monitoring_v3.Aggregation.Aligner, now: float) -> Dict[str, Tuple[float, float, float]]:
+    """One query for a metric of every subscription of the project, fitted per subscription"""
+    seconds = int(now)
+    nanos = int((now - seconds) * 10 ** 9)
+    interval = monitoring_v3.TimeInterval(
+        {
+            "end_time": {"seconds": seconds, "nanos": nanos},
+            "start_time": {"seconds": (seconds - WINDOW_MINUTES * 60), "nanos": nanos},
+        }
+    )
+    aggregation = monitoring_v3.Aggregation(
+        {
+            "alignment_period": {"seconds": 60},
+            "per_series_aligner": aligner,
+        }
+    )
+
+    time_series = await call_api(
+        "monitoring", project_id, monitoring_client.list_time_series,
+        target=metric_type.split("/")[-1], materialize=True,
+        request={
+            "name": f"projects/{project_id}",
+            "filter": f'metric.type="{metric_type}" AND resource.type="pubsub_subscription"',
+            "interval": interval,
+            "view": monitoring_v3.ListTimeSeriesRequest.TimeSeriesView.FULL,
+            "aggregation": aggregation,
+        }
+    )
+
+    return window_fits(time_series, now)
+
+
+def forecast(backlog: float, backlog_slope: float, ack_rate: float,
+             age_minutes: float, age_slope: float) -> Tuple[float, float, Optional[float], float]:
+    """Publish rate, backlog growth per minute, minutes to drain and forecast age of one subscription"""
+    # Whatever was not acked stayed in the backlog
+    publish_rate = max(0.0, ack_rate + backlog_slope / 60.0)
+
+    time_to_drain = None
+    if backlog <= 0:
+        time_to_drain = 0.0
+    elif backlog_slope < 0:
+        time_to_drain = backlog / -backlog_slope
+
+    forecast_age = max(0.0, age_minutes + age_slope * FORECAST_MINUTES)
+
+    return publish_rate, backlog_slope, time_to_drain, forecast_age
+
 
 async def monitor_pubsub(project_id: str) -> List[PubSubMetric]:
-    """Monitor Pub/Sub subscriptions for unacked messages older than 5 minutes"""
+    """Monitor Pub/Sub subscriptions whose oldest unacked message is, or is heading, past 5 minutes"""
     results = []
+    evaluator = get_evaluator(project_id)
 
     try:
-        subscriber = pubsub_v1.SubscriberClient()
         monitoring_client = monitoring_v3.MetricServiceClient()
-
-        project_path = f"projects/{project_id}"
-
-        # List all subscriptions
-        subscriptions = subscriber.list_subscriptions(request={"project": project_path})
-
-        for subscription in subscriptions:
-            try:
-                subscription_name = subscription.name.split('/')[-1]
-
-                # Query metrics for unacked messages
-                now = time.time()
-                seconds = int(now)
-                nanos = int((now - seconds) * 10 ** 9)
-                interval = monitoring_v3.TimeInterval(
-                    {
-                        "end_time": {"seconds": seconds, "nanos": nanos},
-                        "start_time": {"seconds": (seconds - 600), "nanos": nanos},  # Last 10 minutes
-                    }
-                )
-
-                # Query num_undelivered_messages
-                aggregation = monitoring_v3.Aggregation(
-                    {
-                        "alignment_period": {"seconds": 60},
-                        "per_series_aligner": monitoring_v3.Aggregation.Aligner.ALIGN_MEAN,
-                    }
-                )
-
-                results_query = monitoring_client.list_time_series(
-                    request={
-                        "name": project_path,
-                        "filter": f'metric.type="pubsub.googleapis.com/subscription/num_undelivered_messages" '
-                                  f'AND resource.labels.subscription_id="{subscription_name}"',
-                        "interval": interval,
-                        "view": monitoring_v3.ListTimeSeriesRequest.TimeSeriesView.FULL,
-                        "aggregation": aggregation,
-                    }
-                )
-
-                # Get the latest value
-                unacked_count = 0
-                for result in results_query:
-                    if result.points:
-                        unacked_count = int(result.points[0].value.int64_value or result.points[0].value.double_value)
-                        break
-
-                # Query oldest_unacked_message_age
-                oldest_age_minutes = 0.0
-                results_age = monitoring_client.list_time_series(
-                    request={
-                        "name": project_path,
-                        "filter": f'metric.type="pubsub.googleapis.com/subscription/oldest_unacked_message_age" '
-                                  f'AND resource.labels.subscription_id="{subscription_name}"',
-                        "interval": interval,
-                        "view": monitoring_v3.ListTimeSeriesRequest.TimeSeriesView.FULL,
-                        "aggregation": aggregation,
-                    }
-                )
-
-                for result in results_age:
-                    if result.points:
-                        oldest_age_seconds = result.points[0].value.double_value or result.points[0].value.int64_value
-                        oldest_age_minutes = oldest_age_seconds / 60.0
-                        break
-
-                # Only report if there are unacked messages older than 5 minutes
-                if unacked_count > 0 and oldest_age_minutes > 5:
-                    # Determine status based on age and count
-                    if oldest_age_minutes > 30:
-                        status_icon = StatusType.RED
-                    elif oldest_age_minutes > 10:
-                        status_icon = StatusType.YELLOW
-                    else:
-                        status_icon = StatusType.YELLOW
-
-                    results.append(PubSubMetric(
-                        project_id=project_id,
-                        subscription_name=subscription_name,
-                        unacked_messages=unacked_count,
-                        oldest_message_age_minutes=round(oldest_age_minutes, 2),
-                        status=status_icon
-                    ))
-
-            except Exception as e:
-                # Skip individual subscription errors
-                continue
+        now = time.time()
+
+        # Three queries per project, whatever the number of subscriptions
+        Aligner = monitoring_v3.Aggregation.Aligner
+        undelivered = await query_window(monitoring_client, project_id, UNDELIVERED_METRIC, Aligner.ALIGN_MEAN, now)
+        oldest_age = await query_window(monitoring_client, project_id, OLDEST_AGE_METRIC, Aligner.ALIGN_MAX, now)
+        ack_rates = await query_window(monitoring_client, project_id, ACK_RATE_METRIC, Aligner.ALIGN_RATE, now)
+
+        names = [name for name, (backlog, _, _) in undelivered.items() if backlog > 0]
+        rows = []
+        for name in names:
+            backlog, backlog_slope, _ = undelivered[name]
+            age_seconds, age_slope_seconds, _ = oldest_age.get(name, (0.0, 0.0, 0.0))
+            ack_rate = ack_rates.get(name, (0.0, 0.0, 0.0))[2]
+
+            rows.append((backlog, ack_rate, age_seconds / 60.0) + forecast(
+                backlog, backlog_slope, ack_rate, age_seconds / 60.0, age_slope_seconds / 60.0
+            ))
+
+        # Thresholds apply to the oldest age now or at the end of the forecast (>5 minutes by default)
+        statuses = evaluator.classify_rows(
+            "pubsub",
+            names,
+            [max(age, forecast_age) for _, _, age, _, _, _, forecast_age in rows]
+        )
+
+        for name, row, status_icon in zip(names, rows, statuses):
+            backlog, ack_rate, age, publish_rate, growth, time_to_drain, forecast_age = row
+            if status_icon:
+                results.append(PubSubMetric(
+                    project_id=project_id,
+                    subscription_name=name,
+                    unacked_messages=int(backlog),
+                    oldest_message_age_minutes=round(age, 2),
+                    backlog_growth_per_minute=round(growth, 2),
+                    ack_rate_per_second=round(ack_rate, 2),
+                    publish_rate_per_second=round(publish_rate, 2),
+                    time_to_drain_minutes=None if time_to_drain is None else round(time_to_drain, 1),
+                    forecast_age_minutes=round(forecast_age, 2),
+                    status=status_icon
+                ))
 
     except Exception as e:
         results.append(PubSubMetric(
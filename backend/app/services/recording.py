@@ -0,0 +1,133 @@
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import atexit
+import gzip
+import os
+import pickle
+import threading
+import time
+
+# Archive every API call made through call_api to this file
+RECORD_PATH = os.environ.get("GCP_RECORD_PATH", "")
+
+# Serve API calls from this archive instead of the live APIs
+REPLAY_PATH = os.environ.get("GCP_REPLAY_PATH", "")
+
+# Replayed calls take their recorded duration times this factor; 0 is instant
+REPLAY_TIME_SCALE = float(os.environ.get("GCP_REPLAY_TIME_SCALE", "1"))
+
+# (api, project_id, target, client method)
+CallKey = Tuple[str, str, str, str]
+
+ARCHIVE_FORMAT = 1
+
+
+class Recorder:
+    """
+    Appends one pickled record per API call attempt to a gzip archive:
+    the call key, when it started and how long it took, and its result or
+    error. Client results (proto messages, raw Kubernetes dicts) are stored
+    as returned, so replays exercise the same parsing code.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.started_at = time.monotonic()
+        self.calls = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = gzip.open(path, "wb")
+        pickle.dump({"format": ARCHIVE_FORMAT, "recorded_at": time.time()}, self._file)
+        atexit.register(self.close)
+
+    def record(self, key: CallKey, started: float, duration: float,
+               result: Any = None, error: Optional[Exception] = None):
+        """Append one call attempt; called from the worker thread that made it"""
+        if error is not None:
+            try:
+                pickle.dumps(error)
+            except Exception:
+                error = RuntimeError(f"{type(error).__name__}: {str(error)}")
+
+        entry = (key, started - self.started_at, duration, error is None, result if error is None else error)
+
+        with self._lock:
+            if self._file.closed:
+                return
+            try:
+                pickle.dump(entry, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception as e:
+                print(f"Error recording {key[3]} call for {key[1]}: {str(e)}")
+                return
+            self.calls += 1
+
+            # Keep the archive readable if the process is killed
+            if self.calls % 100 == 0:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+class Replayer:
+    """
+    Serves API calls from a recorded archive. Calls with the same key are
+    answered in recorded order and wrap around once exhausted, so the same
+    archive can drive repeated scrapes.
+    """
+
+    def __init__(self, path: str, time_scale: float = REPLAY_TIME_SCALE):
+        self.path = path
+        self.time_scale = time_scale
+        self._calls: Dict[CallKey, List[Tuple[float, bool, Any]]] = {}
+        self._positions: Dict[CallKey, int] = {}
+
+        with gzip.open(path, "rb") as f:
+            header = pickle.load(f)
+            if header.get("format") != ARCHIVE_FORMAT:
+                raise ValueError(f"Unsupported recording format in {path}: {header.get('format')}")
+
+            while True:
+                try:
+                    key, _, duration, ok, payload = pickle.load(f)
+                except (EOFError, gzip.BadGzipFile):
+                    # A recording cut short by a killed process ends mid-record
+                    break
+                self._calls.setdefault(key, []).append((duration, ok, payload))
+
+        _use_offline_credentials()
+
+    def keys(self) -> List[CallKey]:
+        return list(self._calls)
+
+    async def replay(self, key: CallKey) -> Any:
+        """The next recorded answer for a call, after its (scaled) recorded duration"""
+        calls = self._calls.get(key)
+        if not calls:
+            raise LookupError(f"No recorded {key[3]} call for {key[0]} in {key[1]} ({key[2] or '-'})")
+
+        position = self._positions.get(key, 0)
+        self._positions[key] = (position + 1) % len(calls)
+        duration, ok, payload = calls[position]
+
+        if self.time_scale > 0:
+            await asyncio.sleep(duration * self.time_scale)
+
+        if not ok:
+            raise payload
+        return payload
+
+
+def _use_offline_credentials():
+    """Client constructors look up credentials; replays must not need any"""
+    import google.auth
+    from google.auth.credentials import AnonymousCredentials
+
+    google.auth.default = lambda *args, **kwargs: (AnonymousCredentials(), None)
+
+
+recorder = Recorder(RECORD_PATH) if RECORD_PATH else None
+replayer = Replayer(REPLAY_PATH) if REPLAY_PATH else None
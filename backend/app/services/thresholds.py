@@ -0,0 +1,126 @@
+from fnmatch import translate
+from typing import Dict, List, NamedTuple, Optional, Sequence
+from ..config import Config, ThresholdRule, load_config
+from ..models.monitoring import StatusType
+import re
+
+
+class Thresholds(NamedTuple):
+    warning: float  # at or above: reported as YELLOW
+    critical: float  # at or above: reported as RED
+    inclusive: bool  # whether hitting a threshold exactly counts
+
+
+# Built-in thresholds per monitor, overridden by rules in config.json
+DEFAULT_THRESHOLDS: Dict[str, Thresholds] = {
+    "node_pools": Thresholds(80, 95, True),  # utilization %
+    "node_pressure": Thresholds(80, 90, True),  # requested CPU/memory %
+    "pubsub": Thresholds(5, 30, False),  # oldest unacked message age, minutes
+    "pod_restarts": Thresholds(3, 10, False),  # restarts in the last hour
+    "k8s_events": Thresholds(3, 20, False),  # Warning events in the last 10 minutes
+    "url_errors": Thresholds(1, 5, False),  # failed probes over the window, %
+    "latency": Thresholds(3, 10, False),  # p95 seconds
+    "spanner_cpu": Thresholds(45, 65, False),  # high priority CPU %
+    "spanner_storage": Thresholds(75, 90, False),  # storage %
+}
+
+_GLOB_CHARS = re.compile(r"[*?\[]")
+
+
+class ThresholdEvaluator:
+    """
+    Rules compiled once per config. Exact-match patterns are indexed in a
+    dict, glob patterns are precompiled, and the thresholds resolved for a
+    resource key are memoized, so classifying a section costs one dict lookup
+    per row once each distinct key has been seen.
+    """
+
+    def __init__(self, rules: Sequence[ThresholdRule]):
+        self._exact: Dict[str, Dict[str, List[tuple]]] = {}
+        self._globs: Dict[str, List[tuple]] = {}
+        self._resolved: Dict[str, Dict[str, Thresholds]] = {}
+
+        # Rules keep their config order so later rules override earlier ones
+        for position, rule in enumerate(rules):
+            if rule.monitor not in DEFAULT_THRESHOLDS:
+                raise ValueError(f"Unknown monitor in threshold rule: {rule.monitor}")
+
+            if _GLOB_CHARS.search(rule.match):
+                pattern = re.compile(translate(rule.match))
+                self._globs.setdefault(rule.monitor, []).append((position, pattern, rule))
+            else:
+                self._exact.setdefault(rule.monitor, {}).setdefault(rule.match, []).append((position, rule))
+
+    def thresholds(self, monitor: str, key: str) -> Thresholds:
+        """Thresholds that apply to one resource of a monitor"""
+        resolved = self._resolved.setdefault(monitor, {})
+
+        thresholds = resolved.get(key)
+        if thresholds is None:
+            matching = list(self._exact.get(monitor, {}).get(key, []))
+            matching.extend(
+                (position, rule) for position, pattern, rule in self._globs.get(monitor, [])
+                if pattern.match(key)
+            )
+
+            thresholds = DEFAULT_THRESHOLDS[monitor]
+            for _, rule in sorted(matching, key=lambda item: item[0]):
+                thresholds = thresholds._replace(
+                    warning=thresholds.warning if rule.warning is None else rule.warning,
+                    critical=thresholds.critical if rule.critical is None else rule.critical,
+                )
+
+            resolved[key] = thresholds
+
+        return thresholds
+
+    def classify(self, monitor: str, key: str, value: float) -> Optional[StatusType]:
+        """RED or YELLOW if the value crosses a threshold, None if it should not be reported"""
+        warning, critical, inclusive = self.thresholds(monitor, key)
+
+        if inclusive:
+            if value >= critical:
+                return StatusType.RED
+            if value >= warning:
+                return StatusType.YELLOW
+        else:
+            if value > critical:
+                return StatusType.RED
+            if value > warning:
+                return StatusType.YELLOW
+
+        return None
+
+    def classify_rows(self, monitor: str, keys: Sequence[str], values: Sequence[float]) -> List[Optional[StatusType]]:
+        """Classify a whole section in one pass"""
+        classify = self.classify
+        return [classify(monitor, key, value) for key, value in zip(keys, values)]
+
+
+_evaluators: Dict[str, ThresholdEvaluator] = {}
+_evaluators_config: Optional[Config] = None
+
+
+def get_evaluator(project_id: str) -> ThresholdEvaluator:
+    """
+    Evaluator for a project: built-in defaults, then global rules, then the
+    project's own rules. Rebuilt only when config.json changes.
+    """
+    global _evaluators_config
+
+    config = load_config()
+    if config is not _evaluators_config:
+        _evaluators.clear()
+        _evaluators_config = config
+
+    evaluator = _evaluators.get(project_id)
+    if evaluator is None:
+        rules = list(config.thresholds)
+        for project in config.projects:
+            if project.project_id == project_id:
+                rules.extend(project.thresholds)
+                break
+
+        evaluator = _evaluators[project_id] = ThresholdEvaluator(rules)
+
+    return evaluator
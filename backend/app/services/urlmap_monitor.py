@@ -1,13 +1,151 @@
 import httpx
 from google.cloud import compute_v1
-from typing import List
+from array import array
+from typing import Dict, List, Optional, Tuple
 from ..models.monitoring import UrlMapMetric, StatusType
+from .gcp_calls import call_api
+from .recording import replayer
+from .thresholds import get_evaluator
 import asyncio
+import os
+import time
+
+# Requests per hostname per scrape, sent over one kept-alive connection; the
+# first of a burst only warms the connection up and is not timed
+PROBE_BURST_SIZE = max(1, int(os.environ.get("PROBE_BURST_SIZE", "5")))
+
+# Latencies and errors are merged across scrapes over this rolling window
+PROBE_WINDOW_SECONDS = int(os.environ.get("PROBE_WINDOW_SECONDS", "600"))
+PROBE_SLOT_SECONDS = 60
+
+PROBE_TIMEOUT_SECONDS = 10.0
+PROBE_CONCURRENCY = 20
+
+# Log-linear buckets (HDR-style): exact below 64us, then 32 linear
+# sub-buckets per power of two, i.e. within ~3% up to MAX_LATENCY_US
+SUB_BUCKET_BITS = 5
+MAX_LATENCY_US = 60_000_000
+
+
+def bucket_index(value: int) -> int:
+    shift = max(0, value.bit_length() - SUB_BUCKET_BITS - 1)
+    return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+
+def bucket_value(index: int) -> float:
+    """Midpoint of a bucket, in microseconds"""
+    shift = max(0, (index >> SUB_BUCKET_BITS) - 1)
+    return ((index - (shift << SUB_BUCKET_BITS)) << shift) + ((1 << shift) - 1) / 2
+
+
+BUCKET_COUNT = bucket_index(MAX_LATENCY_US) + 1
+
+
+class LatencyHistogram:
+    """Fixed-size latency histogram; histograms merge by adding their counts"""
+
+    def __init__(self):
+        self.counts = array("L", bytes(BUCKET_COUNT * array("L").itemsize))
+        self.total = 0  # timed samples
+        self.requests = 0
+        self.errors = 0
+
+    def record(self, seconds: float):
+        microseconds = min(MAX_LATENCY_US, max(1, int(seconds * 1_000_000)))
+        self.counts[bucket_index(microseconds)] += 1
+        self.total += 1
+
+    def merge(self, other: "LatencyHistogram"):
+        counts = self.counts
+        for index, count in enumerate(other.counts):
+            if count:
+                counts[index] += count
+        self.total += other.total
+        self.requests += other.requests
+        self.errors += other.errors
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Latency in milliseconds below which `percent` of the samples fall"""
+        if not self.total:
+            return None
+
+        rank = max(1, -(-self.total * percent // 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return bucket_value(index) / 1000
+
+        return MAX_LATENCY_US / 1000
+
+
+class RollingHistogram:
+    """One histogram per PROBE_SLOT_SECONDS over the window, merged on read"""
+
+    def __init__(self, window_seconds: int = PROBE_WINDOW_SECONDS, slot_seconds: int = PROBE_SLOT_SECONDS):
+        self.slot_seconds = slot_seconds
+        self.slot_count = max(1, window_seconds // slot_seconds)
+        self._epochs = [-1] * self.slot_count
+        self._slots = [LatencyHistogram() for _ in range(self.slot_count)]
+
+    def current(self, now: Optional[float] = None) -> LatencyHistogram:
+        epoch = int((now or time.time()) // self.slot_seconds)
+        slot = epoch % self.slot_count
+        if self._epochs[slot] != epoch:
+            self._epochs[slot] = epoch
+            self._slots[slot] = LatencyHistogram()
+        return self._slots[slot]
+
+    def merged(self, now: Optional[float] = None) -> LatencyHistogram:
+        epoch = int((now or time.time()) // self.slot_seconds)
+        merged = LatencyHistogram()
+        for slot_epoch, histogram in zip(self._epochs, self._slots):
+            if epoch - self.slot_count < slot_epoch <= epoch:
+                merged.merge(histogram)
+        return merged
+
+
+_histograms: Dict[Tuple[str, str], RollingHistogram] = {}
+
+
+async def probe_host(client: httpx.AsyncClient, url: str, histogram: LatencyHistogram,
+                     burst: int = PROBE_BURST_SIZE) -> Tuple[Optional[int], Optional[str], bool]:
+    """
+    Send a burst of GETs; returns the last status code, the error that ended
+    the burst (if any) and
+    whether every request of the burst failed. A connect error or timeout
+    ends the burst, so an unreachable host costs one timeout, not one per
+    request.
+    """
+    status_code = None
+    warm, server_errors = False, 0
+
+    for attempt in range(burst):
+        histogram.requests += 1
+        started = time.perf_counter()
+        try:
+            response = await client.get(url)
+        except Exception as e:
+            histogram.errors += 1
+            return status_code, str(e), server_errors == attempt
+
+        # Only requests on a connection some earlier request warmed up are timed
+        if warm or burst == 1:
+            histogram.record(time.perf_counter() - started)
+        warm = True
+
+        status_code = response.status_code
+        if status_code >= 500:
+            server_errors += 1
+            histogram.errors += 1
+
+    return status_code, None, server_errors == burst
 
 
 async def monitor_url_maps(project_id: str) -> List[UrlMapMetric]:
     """Monitor URL maps and perform synthetic testing"""
     results = []
+    evaluator = get_evaluator(project_id)
 
     try:
         # Initialize the URL Maps client
@@ -15,7 +153,7 @@ async def monitor_url_maps(project_id: str) -> List[UrlMapMetric]:
 
         # List all URL maps in the project
         request = compute_v1.ListUrlMapsRequest(project=project_id)
-        url_maps = url_maps_client.list(request=request)
+        url_maps = await call_api("compute", project_id, url_maps_client.list, request=request, materialize=True)
 
         # Collect hostnames from all URL maps
         hostnames_to_test = []
@@ -36,55 +174,75 @@ async def monitor_url_maps(project_id: str) -> List[UrlMapMetric]:
                     "hostname": "no-hostname-configured"
                 })
 
-        # Test each hostname
-        async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
-            for item in hostnames_to_test:
-                hostname = item["hostname"]
-                url_map_name = item["url_map_name"]
-
-                if hostname == "no-hostname-configured":
-                    results.append(UrlMapMetric(
-                        project_id=project_id,
-                        url_map_name=url_map_name,
-                        hostname=hostname,
-                        http_status=None,
-                        status=StatusType.GREY,
-                        error="No hostname configured"
-                    ))
-                    continue
-
-                # Construct URL (try HTTPS first)
-                url = f"https://{hostname}"
-
-                try:
-                    response = await client.get(url)
-                    status_code = response.status_code
-
-                    # Determine status based on HTTP code
-                    if status_code == 200:
-                        status_icon = StatusType.GREEN
-                    elif 200 < status_code < 500:
-                        status_icon = StatusType.YELLOW
-                    else:
-                        status_icon = StatusType.RED
-
-                    results.append(UrlMapMetric(
-                        project_id=project_id,
-                        url_map_name=url_map_name,
-                        hostname=hostname,
-                        http_status=status_code,
-                        status=status_icon
-                    ))
-
-                except Exception as e:
-                    results.append(UrlMapMetric(
-                        project_id=project_id,
-                        url_map_name=url_map_name,
-                        hostname=hostname,
-                        http_status=None,
-                        status=StatusType.RED,
-                        error=str(e)
-                    ))
+        # Hostnames no longer in any URL map stop holding a window
+        hostnames = {item["hostname"] for item in hostnames_to_test}
+        for key in [key for key in _histograms if key[0] == project_id and key[1] not in hostnames]:
+            del _histograms[key]
+
+        semaphore = asyncio.Semaphore(PROBE_CONCURRENCY)
+
+        async def test_hostname(client: httpx.AsyncClient, url_map_name: str, hostname: str) -> UrlMapMetric:
+            if hostname == "no-hostname-configured":
+                return UrlMapMetric(
+                    project_id=project_id,
+                    url_map_name=url_map_name,
+                    hostname=hostname,
+                    http_status=None,
+                    status=StatusType.GREY,
+                    error="No hostname configured"
+                )
+
+            # Probes are not part of recordings; replays never send live traffic
+            if replayer is not None:
+                return UrlMapMetric(
+                    project_id=project_id,
+                    url_map_name=url_map_name,
+                    hostname=hostname,
+                    http_status=None,
+                    status=StatusType.GREY,
+                    error="Not probed during replay"
+                )
+
+            rolling = _histograms.get((project_id, hostname))
+            if rolling is None:
+                rolling = _histograms[(project_id, hostname)] = RollingHistogram()
+
+            # Construct URL (try HTTPS first)
+            async with semaphore:
+                status_code, error, down = await probe_host(client, f"https://{hostname}", rolling.current())
+
+            window = rolling.merged()
+            error_ratio = window.errors / max(1, window.requests)
+
+            # A burst that failed entirely is down; otherwise the error ratio over the
+            # window decides, then the last HTTP code (200 green, anything else yellow)
+            if down:
+                status_icon = StatusType.RED
+            else:
+                status_icon = evaluator.classify("url_errors", hostname, error_ratio * 100)
+                if status_icon is None:
+                    status_icon = StatusType.GREEN if status_code == 200 else StatusType.YELLOW
+
+            return UrlMapMetric(
+                project_id=project_id,
+                url_map_name=url_map_name,
+                hostname=hostname,
+                http_status=status_code,
+                status=status_icon,
+                error=error,
+                p50_ms=window.percentile(50),
+                p95_ms=window.percentile(95),
+                p99_ms=window.percentile(99),
+                error_ratio=round(error_ratio, 4),
+                probes=window.requests
+            )
+
+        # Hostnames are probed concurrently, each burst over its own kept-alive connection
+        async with httpx.AsyncClient(timeout=PROBE_TIMEOUT_SECONDS, follow_redirects=True) as client:
+            results.extend(await asyncio.gather(*[
+                test_hostname(client, item["url_map_name"], item["hostname"])
+                for item in hostnames_to_test
+            ]))
 
     except Exception as e:
         results.append(UrlMapMetric(
@@ -0,0 +1,57 @@
+from typing import List, Sequence
+from .config import Config, ProjectConfig
+from .models.monitoring import MonitoringResponse
+from datetime import datetime
+import hashlib
+import os
+
+# This replica's index and the total number of replicas; one replica means no sharding
+SHARD_ID = int(os.environ.get("SHARD_ID", "0"))
+SHARD_COUNT = int(os.environ.get("SHARD_COUNT", "1"))
+
+# Base URLs of all shard replicas, merged by /api/metrics/aggregate
+SHARD_URLS = [url.strip().rstrip("/") for url in os.environ.get("SHARD_URLS", "").split(",") if url.strip()]
+
+
+def _weight(project_id: str, replica: int) -> int:
+    digest = hashlib.blake2b(f"{project_id}/{replica}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def shard_for(project_id: str, shard_count: int = SHARD_COUNT) -> int:
+    """
+    Replica owning a project, by rendezvous (highest random weight) hashing.
+    Changing the replica count from N to N+1 only moves the ~1/(N+1) of
+    projects that the new replica wins; all other assignments stay put.
+    """
+    return max(range(shard_count), key=lambda replica: _weight(project_id, replica))
+
+
+def shard_projects(projects: Sequence[ProjectConfig], shard_id: int = SHARD_ID,
+                   shard_count: int = SHARD_COUNT) -> List[ProjectConfig]:
+    """Projects this replica is responsible for"""
+    if shard_count <= 1:
+        return list(projects)
+    return [project for project in projects if shard_for(project.project_id, shard_count) == shard_id]
+
+
+def shard_config(config: Config, shard_id: int = SHARD_ID, shard_count: int = SHARD_COUNT) -> Config:
+    """The config restricted to this replica's shard"""
+    if shard_count <= 1:
+        return config
+    return config.model_copy(update={"projects": shard_projects(config.projects, shard_id, shard_count)})
+
+
+def merge_responses(responses: Sequence[MonitoringResponse], errors: Sequence[str] = ()) -> MonitoringResponse:
+    """Merge shard snapshots into one response; the oldest timestamp wins"""
+    sections = {
+        name: [row for response in responses for row in getattr(response, name)]
+        for name in MonitoringResponse.model_fields
+        if name not in ("timestamp", "errors")
+    }
+
+    return MonitoringResponse(
+        **sections,
+        timestamp=min((response.timestamp for response in responses), default=datetime.utcnow().isoformat()),
+        errors=[error for response in responses for error in response.errors] + list(errors)
+    )
@@ -0,0 +1,86 @@
+from typing import Optional, Tuple
+import os
+import socket
+import sqlite3
+import time
+
+# Path of the SQLite file shared by all workers; empty disables multi-worker mode
+SNAPSHOT_STORE_PATH = os.environ.get("SNAPSHOT_STORE_PATH", "")
+
+# The elected collector must renew its lease within this many seconds
+LEASE_TTL_SECONDS = float(os.environ.get("LEASE_TTL_SECONDS", "30"))
+
+
+class SnapshotStore:
+    """
+    SQLite-backed store shared by all worker processes on a host.
+    It holds a single collector lease and the latest serialized snapshot.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.holder = f"{socket.gethostname()}:{os.getpid()}"
+        self._version = -1
+        self._body: Optional[bytes] = None
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS lease "
+            "(id INTEGER PRIMARY KEY CHECK (id = 1), holder TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS snapshot "
+            "(id INTEGER PRIMARY KEY CHECK (id = 1), version INTEGER NOT NULL, body BLOB NOT NULL)"
+        )
+
+    def try_acquire_lease(self, ttl: float = LEASE_TTL_SECONDS) -> bool:
+        """Take or renew the collector lease; True if this process holds it"""
+        now = time.time()
+
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._conn.execute("SELECT holder, expires_at FROM lease WHERE id = 1").fetchone()
+            acquired = row is None or row[0] == self.holder or row[1] < now
+            if acquired:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO lease (id, holder, expires_at) VALUES (1, ?, ?)",
+                    (self.holder, now + ttl)
+                )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+        return acquired
+
+    def release_lease(self):
+        """Give up the lease so another worker can take over immediately"""
+        self._conn.execute("DELETE FROM lease WHERE id = 1 AND holder = ?", (self.holder,))
+
+    def publish(self, body: bytes):
+        """Store a new serialized snapshot"""
+        self._conn.execute(
+            "INSERT INTO snapshot (id, version, body) VALUES (1, 1, ?) "
+            "ON CONFLICT (id) DO UPDATE SET version = version + 1, body = excluded.body",
+            (body,)
+        )
+
+    def read(self) -> Tuple[int, Optional[bytes]]:
+        """
+        Latest snapshot version and serialized body. The body is only fetched
+        when the version changed, and the same bytes object is served until then.
+        """
+        row = self._conn.execute("SELECT version FROM snapshot WHERE id = 1").fetchone()
+        if row is None:
+            return -1, None
+
+        if row[0] != self._version:
+            version, body = self._conn.execute("SELECT version, body FROM snapshot WHERE id = 1").fetchone()
+            self._version, self._body = version, bytes(body)
+
+        return self._version, self._body
+
+
+snapshot_store = SnapshotStore(SNAPSHOT_STORE_PATH) if SNAPSHOT_STORE_PATH else None
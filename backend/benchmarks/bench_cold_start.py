@@ -0,0 +1,69 @@
+"""
+Measure backend cold start: importing the app, serving /api/health, and
+loading every monitor with its client libraries.
+
+Run from the backend directory:
+    python -m benchmarks.bench_cold_start --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Runs in a fresh interpreter each time, so nothing is already imported
+PROBE = """
+import asyncio, json, sys, time
+started = time.perf_counter()
+
+from fastapi.testclient import TestClient
+import app.main
+imported = time.perf_counter()
+
+with TestClient(app.main.app) as client:
+    client.get("/api/health").raise_for_status()
+health = time.perf_counter()
+loaded = set(sys.modules)
+
+from app.collector import SECTIONS, load_monitor
+async def load_all():
+    for section in SECTIONS:
+        await load_monitor(section)
+asyncio.run(load_all())
+monitors = time.perf_counter()
+
+print(json.dumps({
+    "import_app": imported - started,
+    "health_ready": health - started,
+    "all_monitors_loaded": monitors - started,
+    "heavy_modules_before_health": sorted(
+        name for name in ("google.cloud.compute_v1", "google.cloud.monitoring_v3", "google.cloud.spanner_v1",
+                          "google.cloud.container_v1", "kubernetes.client")
+        if name in loaded
+    ),
+}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    runs = []
+    for _ in range(args.repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE], capture_output=True, text=True, check=True,
+            env={**os.environ, "COLLECT_INTERVAL_SECONDS": "0"},
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+
+    for key in ("import_app", "health_ready", "all_monitors_loaded"):
+        timings = [run[key] for run in runs]
+        print(f"{key:>20}: median={statistics.median(timings) * 1000:.0f}ms worst={max(timings) * 1000:.0f}ms")
+    print(f"heavy modules loaded before /api/health: {runs[-1]['heavy_modules_before_health'] or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Replay a synthetic Kubernetes event storm through the event aggregator.
+
+Run from the backend directory:
+    python -m benchmarks.bench_event_storm --events-per-minute 20000 --minutes 70
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from app.services.k8s_events_monitor import EventAggregator, MAX_TRACKED_EVENTS
+
+REASONS = ["BackOff", "OOMKilling", "Failed", "FailedScheduling", "Unhealthy", "FailedMount"]
+
+
+def build_event(uid: str, timestamp: float, object_count: int, count: int = 1) -> dict:
+    # A few hot objects and a long tail, like a crash-looping rollout
+    name = f"pod-{int(random.paretovariate(1.2)) % object_count}"
+    return {
+        "type": "Warning",
+        "reason": random.choice(REASONS),
+        "count": count,
+        "lastTimestamp": datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "metadata": {"uid": uid, "namespace": f"ns-{hash(name) % 50}"},
+        "involvedObject": {"kind": "Pod", "name": name, "namespace": f"ns-{hash(name) % 50}"},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events-per-minute", type=int, default=20000)
+    parser.add_argument("--minutes", type=int, default=70)
+    parser.add_argument("--objects", type=int, default=50000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    aggregator = EventAggregator()
+    start = time.time() - args.minutes * 60
+
+    tracemalloc.start()
+    elapsed = 0.0
+    for minute in range(args.minutes):
+        events = []
+        for i in range(args.events_per_minute):
+            timestamp = start + minute * 60 + i * 60 / args.events_per_minute
+            # Each event is repeated twice more with a higher count
+            uid = f"{minute}-{i - i % 3}"
+            events.append((build_event(uid, timestamp, args.objects, count=1 + i % 3), timestamp))
+
+        started = time.perf_counter()
+        for event, timestamp in events:
+            aggregator.record(event, now=timestamp)
+        elapsed += time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = args.events_per_minute * args.minutes
+    now = start + args.minutes * 60
+    recent = aggregator.window_counts(10, now=now)
+    top = sorted(recent.items(), key=lambda item: item[1], reverse=True)[:3]
+
+    print(f"events={total} throughput={total / elapsed:,.0f}/s")
+    print(f"keys held={aggregator.size()} (max {2 * aggregator.bucket_count * aggregator.max_keys}) "
+          f"uids tracked={len(aggregator._last_counts)} (max {MAX_TRACKED_EVENTS})")
+    print(f"peak traced memory={peak / 1024 / 1024:.1f}MiB (includes the generated events of one minute)")
+    for key, count in top:
+        print(f"  {count:>6} {key}")
+
+
+if __name__ == "__main__":
+    main()
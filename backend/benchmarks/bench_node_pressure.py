@@ -0,0 +1,70 @@
+"""
+Benchmark node pressure aggregation on a synthetic large cluster.
+
+Run from the backend directory:
+    python -m benchmarks.bench_node_pressure --nodes 5000 --pods 100000
+"""
+import argparse
+import random
+import time
+
+from app.services.node_pressure_monitor import aggregate_node_pressure, parse_quantity
+
+
+def build_cluster(node_count: int, pod_count: int, pool_count: int = 20):
+    nodes = [
+        {
+            "metadata": {
+                "name": f"node-{i}",
+                "labels": {"cloud.google.com/gke-nodepool": f"pool-{i % pool_count}"},
+            },
+            "status": {"allocatable": {"cpu": "7910m", "memory": "29Gi"}},
+        }
+        for i in range(node_count)
+    ]
+
+    cpu_requests = ["100m", "250m", "500m", "1", "2"]
+    memory_requests = ["128Mi", "256Mi", "512Mi", "1Gi", "2Gi"]
+    pods = [
+        {
+            "spec": {
+                "nodeName": f"node-{random.randrange(node_count)}",
+                "containers": [
+                    {"resources": {"requests": {
+                        "cpu": random.choice(cpu_requests),
+                        "memory": random.choice(memory_requests),
+                    }}},
+                    {"resources": {"requests": {"cpu": "50m", "memory": "64Mi"}}},
+                ],
+            },
+            "status": {"phase": "Running"},
+        }
+        for _ in range(pod_count)
+    ]
+
+    return nodes, pods
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=5000)
+    parser.add_argument("--pods", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(0)
+    nodes, pods = build_cluster(args.nodes, args.pods)
+
+    timings = []
+    for _ in range(args.repeat):
+        parse_quantity.cache_clear()
+        started = time.perf_counter()
+        pools = aggregate_node_pressure(nodes, pods)
+        timings.append(time.perf_counter() - started)
+
+    print(f"nodes={args.nodes} pods={args.pods} pools={len(pools)}")
+    print(f"best={min(timings) * 1000:.1f}ms worst={max(timings) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark the Pub/Sub window fits on synthetic Monitoring responses.
+
+Run from the backend directory:
+    python -m benchmarks.bench_pubsub_fits --subscriptions 5000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from app.services.pubsub_monitor import WINDOW_MINUTES, forecast, window_fits
+
+
+def build_series(subscription_count: int, now: float):
+    """Time series shaped like list_time_series results, newest point first"""
+    series = []
+    for i in range(subscription_count):
+        start, slope = random.uniform(0, 10000), random.uniform(-200, 200)
+        points = [
+            SimpleNamespace(
+                interval=SimpleNamespace(end_time=datetime.fromtimestamp(now - minute * 60, timezone.utc)),
+                value=SimpleNamespace(double_value=max(0.0, start - slope * minute), int64_value=0),
+            )
+            for minute in range(WINDOW_MINUTES)
+        ]
+        series.append(SimpleNamespace(resource=SimpleNamespace(labels={"subscription_id": f"sub-{i}"}), points=points))
+    return series
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--subscriptions", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(0)
+    now = time.time()
+    undelivered = build_series(args.subscriptions, now)
+    oldest_age = build_series(args.subscriptions, now)
+    ack_rates = build_series(args.subscriptions, now)
+
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        fits = [window_fits(series, now) for series in (undelivered, oldest_age, ack_rates)]
+        forecasts = [
+            forecast(backlog, slope, fits[2][name][2], fits[1][name][0] / 60.0, fits[1][name][1] / 60.0)
+            for name, (backlog, slope, _) in fits[0].items()
+        ]
+        timings.append(time.perf_counter() - started)
+
+    draining = sum(1 for _, _, time_to_drain, _ in forecasts if time_to_drain is not None)
+    print(f"subscriptions={args.subscriptions} points={3 * args.subscriptions * WINDOW_MINUTES} draining={draining}")
+    print(f"best={min(timings) * 1000:.1f}ms worst={max(timings) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Replay a recorded scrape through the full metrics pipeline, offline.
+
+Record one against the live APIs first, e.g. by running the backend or the CLI with
+    GCP_RECORD_PATH=recordings/incident.pkl.gz python -m app.collect
+
+Then run from the backend directory:
+    python -m benchmarks.bench_replay recordings/incident.pkl.gz --time-scale 0 --repeat 5
+"""
+import argparse
+import asyncio
+import os
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("archive", help="archive written with GCP_RECORD_PATH")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="recorded call durations times this (0: instant)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--config", help="config.json the recording was made with")
+    args = parser.parse_args()
+
+    # The client layer picks the archive up when it is first imported
+    os.environ["GCP_REPLAY_PATH"] = args.archive
+    os.environ["GCP_REPLAY_TIME_SCALE"] = str(args.time_scale)
+
+    from app import config as config_module
+    from app.collector import collect_metrics
+    from app.services.recording import replayer
+
+    if args.config:
+        config_module.CONFIG_PATH = args.config
+    config = config_module.load_config()
+
+    print(f"archive={args.archive} recorded call keys={len(replayer.keys())} time_scale={args.time_scale}")
+    for run in range(args.repeat):
+        started = time.perf_counter()
+        response = asyncio.run(collect_metrics(config))
+        elapsed = time.perf_counter() - started
+
+        rows = sum(len(value) for value in response.model_dump().values() if isinstance(value, list))
+        print(f"run {run + 1}: {elapsed * 1000:.0f}ms rows={rows} errors={len(response.errors)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark pod restart history updates on a synthetic large cluster.
+
+Run from the backend directory:
+    python -m benchmarks.bench_restart_history --pods 100000 --minutes 70
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from app.services.pod_restart_monitor import RestartHistory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pods", type=int, default=100000)
+    parser.add_argument("--minutes", type=int, default=70)
+    parser.add_argument("--interval", type=int, default=60, help="seconds between scrapes")
+    parser.add_argument("--churn", type=float, default=0.01, help="fraction of pods replaced per scrape")
+    args = parser.parse_args()
+
+    random.seed(0)
+    uids = [f"pod-{i}" for i in range(args.pods)]
+    counts = [0] * args.pods
+    created = [None] * args.pods
+    crash_looping = set(random.sample(range(args.pods), args.pods // 100))
+    next_uid = args.pods
+
+    history = RestartHistory()
+    start = time.time() - args.minutes * 60
+
+    tracemalloc.start()
+    timings = []
+    for scrape in range(args.minutes * 60 // args.interval):
+        now = start + scrape * args.interval
+
+        for i in crash_looping:
+            counts[i] += 1
+        for i in random.sample(range(args.pods), int(args.pods * args.churn)):
+            uids[i], counts[i] = f"pod-{next_uid}", 0
+            next_uid += 1
+
+        started = time.perf_counter()
+        restarts_10m, restarts_60m = history.update(uids, counts, created, now=now)
+        timings.append(time.perf_counter() - started)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    flagged = sum(1 for restarts in restarts_60m if restarts > 3)
+    steady = sorted(timings[1:])
+    print(f"pods={args.pods} scrapes={len(timings)} tracked={history.size()} flagged={flagged}")
+    print(f"update median={steady[len(steady) // 2] * 1000:.1f}ms worst={steady[-1] * 1000:.1f}ms")
+    print(f"peak traced memory={peak / 1024 / 1024:.1f}MiB "
+          f"(history arrays={sum(len(c) for c in history._columns) * 2 / 1024 / 1024:.1f}MiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,46 @@
 'use client';
 
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import { api } from '../services/api';
-import { MonitoringResponse } from '../types/monitoring';
+import { MetricsStreamMessage, MonitoringResponse } from '../types/monitoring';
 import { MetricsTable } from '../components/MetricsTable';
 
+// Seconds to wait before reconnecting the push channel after it closes
+const STREAM_RETRY_SECONDS = 30;
+
+type TransitionsMessage = Extract<MetricsStreamMessage, { type: 'transitions' }>;
+
+function applyTransitions(
+  current: MonitoringResponse,
+  keyFields: Record<string, string[]>,
+  message: TransitionsMessage
+): MonitoringResponse {
+  const next: any = { ...current, timestamp: message.timestamp, errors: message.errors };
+
+  for (const transition of message.transitions) {
+    const fields = keyFields[transition.section] || [];
+    const rowKey = (row: Record<string, any>) => fields.map((field) => String(row[field])).join('\u0000');
+    const key = rowKey(transition.row);
+
+    const rows = (next[transition.section] || []).filter((row: Record<string, any>) => rowKey(row) !== key);
+    if (transition.kind !== 'disappeared') {
+      rows.push(transition.row);
+    }
+    next[transition.section] = rows;
+  }
+
+  return next;
+}
+
 export default function Home() {
   const [monitoring, setMonitoring] = useState<MonitoringResponse | null>(null);
   const [isMonitoring, setIsMonitoring] = useState(false);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [lastUpdate, setLastUpdate] = useState<string>('');
+  const [streamConnected, setStreamConnected] = useState(false);
+  const [streamAttempt, setStreamAttempt] = useState(0);
+  const keyFieldsRef = useRef<Record<string, string[]>>({});
 
   // Get refresh interval from environment variable (default: 900 seconds)
   const refreshIntervalSeconds = parseInt(process.env.NEXT_PUBLIC_REFRESH_INTERVAL || '900', 10);
@@ -33,12 +63,44 @@ export default function Home() {
     }
   }, [isMonitoring]);
 
+  // Pushed status transitions keep statuses current between the polls below
+  useEffect(() => {
+    if (!isMonitoring || !api.streamAvailable) return;
+
+    let retry: ReturnType<typeof setTimeout> | undefined;
+    const unsubscribe = api.subscribeMetrics(
+      (message) => {
+        if (message.type === 'snapshot') {
+          keyFieldsRef.current = message.key_fields;
+          setMonitoring(message.data);
+          setStreamConnected(true);
+          setError(null);
+          setLastUpdate(new Date().toLocaleString());
+        } else if (message.type === 'transitions') {
+          setMonitoring((current) => current && applyTransitions(current, keyFieldsRef.current, message));
+          setLastUpdate(new Date().toLocaleString());
+        }
+      },
+      () => {
+        setStreamConnected(false);
+        retry = setTimeout(() => setStreamAttempt((attempt) => attempt + 1), STREAM_RETRY_SECONDS * 1000);
+      }
+    );
+
+    return () => {
+      unsubscribe();
+      clearTimeout(retry);
+      setStreamConnected(false);
+    };
+  }, [isMonitoring, streamAttempt]);
+
   useEffect(() => {
     if (isMonitoring) {
-      // Fetch immediately when enabled
-      fetchMetrics();
+      // Fetch immediately when enabled; a connected stream has just sent a snapshot
+      if (!streamConnected) fetchMetrics();
 
-      // Set up auto-refresh based on configured interval
+      // Keep refreshing at the configured interval even while streaming: the stream
+      // only carries status changes, so values of rows that stay green would go stale
       const interval = setInterval(fetchMetrics, refreshIntervalMs);
 
       return () => clearInterval(interval);
@@ -47,7 +109,7 @@ export default function Home() {
       setMonitoring(null);
       setLastUpdate('');
     }
-  }, [isMonitoring, fetchMetrics, refreshIntervalMs]);
+  }, [isMonitoring, streamConnected, fetchMetrics, refreshIntervalMs]);
 
   const toggleMonitoring = () => {
     setIsMonitoring((prev) => !prev);
@@ -86,7 +148,7 @@ export default function Home() {
 
         {lastUpdate && (
           <div style={styles.lastUpdate}>
-            Last updated: {lastUpdate}
+            Last updated: {lastUpdate} {streamConnected && '(live)'}
           </div>
         )}
       </div>
@@ -113,6 +175,10 @@ export default function Home() {
               { key: 'url_map_name', label: 'URL Map' },
               { key: 'hostname', label: 'Hostname' },
               { key: 'http_status', label: 'HTTP Status' },
+              { key: 'p50_ms', label: 'p50 (ms)' },
+              { key: 'p95_ms', label: 'p95 (ms)' },
+              { key: 'p99_ms', label: 'p99 (ms)' },
+              { key: 'error_ratio', label: 'Errors', render: (val: number) => `${(val * 100).toFixed(1)}%` },
               { key: 'status', label: 'Status' },
               { key: 'error', label: 'Error' },
             ]}
@@ -134,16 +200,21 @@ export default function Home() {
           />
 
           <MetricsTable
-            title="3. Pub/Sub - Unacked Messages (>5 min old)"
+            title="3. Pub/Sub - Unacked Messages (>5 min old, now or within 30 min)"
             columns={[
               { key: 'project_id', label: 'Project ID' },
               { key: 'subscription_name', label: 'Subscription' },
               { key: 'unacked_messages', label: 'Unacked Messages' },
+              { key: 'backlog_growth_per_minute', label: 'Backlog Growth (/min)' },
+              { key: 'publish_rate_per_second', label: 'Publish (/s)' },
+              { key: 'ack_rate_per_second', label: 'Ack (/s)' },
+              { key: 'time_to_drain_minutes', label: 'Time to Drain (min)', render: (val: number | null) => val === null ? 'Not draining' : val },
               { key: 'oldest_message_age_minutes', label: 'Oldest Age (min)' },
+              { key: 'forecast_age_minutes', label: 'Age in 30 min' },
               { key: 'status', label: 'Status' },
             ]}
             data={monitoring.pubsub}
-            emptyMessage="No unacked messages older than 5 minutes"
+            emptyMessage="No subscriptions falling behind"
           />
 
           <MetricsTable
@@ -163,17 +234,19 @@ export default function Home() {
           />
 
           <MetricsTable
-            title="5. GKE Pods - High Restart Count (>5)"
+            title="5. GKE Pods - Recent Restarts (>3 in the last hour)"
             columns={[
               { key: 'project_id', label: 'Project ID' },
               { key: 'cluster_name', label: 'Cluster' },
               { key: 'namespace', label: 'Namespace' },
               { key: 'pod_name', label: 'Pod Name' },
-              { key: 'restart_count', label: 'Restart Count' },
+              { key: 'restarts_10m', label: 'Last 10 min' },
+              { key: 'restarts_60m', label: 'Last 60 min' },
+              { key: 'restart_count', label: 'Total Restarts' },
               { key: 'status', label: 'Status' },
             ]}
             data={monitoring.pod_restarts}
-            emptyMessage="No pods with high restart counts"
+            emptyMessage="No pods restarting recently"
           />
 
           <MetricsTable
@@ -200,6 +273,58 @@ export default function Home() {
             data={monitoring.spanner}
             emptyMessage="Spanner instances are healthy"
           />
+
+          <MetricsTable
+            title="8. GKE Node Pools - Resource Pressure (≥80% requested)"
+            columns={[
+              { key: 'project_id', label: 'Project ID' },
+              { key: 'cluster_name', label: 'Cluster' },
+              { key: 'node_pool_name', label: 'Node Pool' },
+              { key: 'node_count', label: 'Nodes' },
+              { key: 'saturated_nodes', label: 'Saturated Nodes' },
+              { key: 'cpu_requested_percent', label: 'CPU Requested %' },
+              { key: 'memory_requested_percent', label: 'Memory Requested %' },
+              { key: 'max_node_cpu_percent', label: 'Max Node CPU %' },
+              { key: 'max_node_memory_percent', label: 'Max Node Memory %' },
+              { key: 'status', label: 'Status' },
+            ]}
+            data={monitoring.node_pressure}
+            emptyMessage="No node pools under resource pressure"
+          />
+
+          <MetricsTable
+            title="9. Kubernetes Events - Top Warning Offenders"
+            columns={[
+              { key: 'project_id', label: 'Project ID' },
+              { key: 'cluster_name', label: 'Cluster' },
+              { key: 'reason', label: 'Reason' },
+              { key: 'namespace', label: 'Namespace' },
+              { key: 'object_kind', label: 'Kind' },
+              { key: 'object_name', label: 'Object' },
+              { key: 'count_10m', label: 'Last 10 min' },
+              { key: 'count_60m', label: 'Last 60 min' },
+              { key: 'status', label: 'Status' },
+            ]}
+            data={monitoring.k8s_events}
+            emptyMessage="No recurring warning events"
+          />
+
+          <MetricsTable
+            title="API Health - Failing, Suspended or Throttled Targets"
+            columns={[
+              { key: 'api', label: 'API' },
+              { key: 'project_id', label: 'Project ID' },
+              { key: 'target', label: 'Target' },
+              { key: 'state', label: 'Circuit' },
+              { key: 'consecutive_failures', label: 'Failures' },
+              { key: 'retries', label: 'Retries' },
+              { key: 'throttled_calls', label: 'Throttled' },
+              { key: 'last_error', label: 'Last Error' },
+              { key: 'status', label: 'Status' },
+            ]}
+            data={monitoring.api_health}
+            emptyMessage="All GCP and GKE APIs are responding"
+          />
         </div>
       )}
 
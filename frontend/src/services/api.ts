@@ -1,14 +1,35 @@
 import axios from 'axios';
-import { MonitoringResponse } from '../types/monitoring';
+import { MetricsStreamMessage, MonitoringResponse } from '../types/monitoring';
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
+// Set to /api/metrics/aggregate when the backend is sharded across replicas
+const METRICS_PATH = process.env.NEXT_PUBLIC_METRICS_PATH || '/api/metrics';
+const WS_BASE_URL = API_BASE_URL.replace(/^http/, 'ws');
 
 export const api = {
+  // The stream mirrors this replica's /api/metrics; a merged or other view would be overwritten by it
+  streamAvailable: METRICS_PATH === '/api/metrics',
+
   async getMetrics(): Promise<MonitoringResponse> {
-    const response = await axios.get<MonitoringResponse>(`${API_BASE_URL}/api/metrics`);
+    const response = await axios.get<MonitoringResponse>(`${API_BASE_URL}${METRICS_PATH}`);
     return response.data;
   },
 
+  // Subscribe to pushed status transitions; returns a function that closes the stream
+  subscribeMetrics(
+    onMessage: (message: MetricsStreamMessage) => void,
+    onClose: () => void
+  ): () => void {
+    const socket = new WebSocket(`${WS_BASE_URL}/ws/metrics`);
+    socket.onmessage = (event) => onMessage(JSON.parse(event.data));
+    socket.onclose = () => onClose();
+
+    return () => {
+      socket.onclose = null;
+      socket.close();
+    };
+  },
+
   async healthCheck(): Promise<{ status: string; timestamp: string }> {
     const response = await axios.get(`${API_BASE_URL}/api/health`);
     return response.data;
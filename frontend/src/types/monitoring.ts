@@ -5,6 +5,11 @@ export interface UrlMapMetric {
   http_status: number | null;
   status: string;
   error?: string;
+  p50_ms: number | null;
+  p95_ms: number | null;
+  p99_ms: number | null;
+  error_ratio: number;
+  probes: number;
 }
 
 export interface PodMetric {
@@ -21,6 +26,11 @@ export interface PubSubMetric {
   subscription_name: string;
   unacked_messages: number;
   oldest_message_age_minutes: number;
+  backlog_growth_per_minute: number;
+  ack_rate_per_second: number;
+  publish_rate_per_second: number;
+  time_to_drain_minutes: number | null;
+  forecast_age_minutes: number;
   status: string;
 }
 
@@ -35,12 +45,39 @@ export interface NodePoolMetric {
   is_regional: boolean;
 }
 
+export interface NodePressureMetric {
+  project_id: string;
+  cluster_name: string;
+  node_pool_name: string;
+  node_count: number;
+  saturated_nodes: number;
+  cpu_requested_percent: number;
+  memory_requested_percent: number;
+  max_node_cpu_percent: number;
+  max_node_memory_percent: number;
+  status: string;
+}
+
 export interface PodRestartMetric {
   project_id: string;
   cluster_name: string;
   namespace: string;
   pod_name: string;
   restart_count: number;
+  restarts_10m: number;
+  restarts_60m: number;
+  status: string;
+}
+
+export interface K8sEventMetric {
+  project_id: string;
+  cluster_name: string;
+  reason: string;
+  namespace: string;
+  object_kind: string;
+  object_name: string;
+  count_10m: number;
+  count_60m: number;
   status: string;
 }
 
@@ -59,14 +96,41 @@ export interface SpannerMetric {
   status: string;
 }
 
+export interface ApiHealthMetric {
+  api: string;
+  project_id: string;
+  target: string;
+  state: string;
+  consecutive_failures: number;
+  retries: number;
+  throttled_calls: number;
+  last_error?: string;
+  status: string;
+}
+
 export interface MonitoringResponse {
   url_maps: UrlMapMetric[];
   pods: PodMetric[];
   pubsub: PubSubMetric[];
   node_pools: NodePoolMetric[];
+  node_pressure: NodePressureMetric[];
   pod_restarts: PodRestartMetric[];
+  k8s_events: K8sEventMetric[];
   latency: LatencyMetric[];
   spanner: SpannerMetric[];
+  api_health: ApiHealthMetric[];
   timestamp: string;
   errors: string[];
 }
+
+export interface MetricTransition {
+  kind: 'appeared' | 'changed' | 'disappeared';
+  section: string;
+  row: Record<string, any>;
+  previous_status?: string;
+}
+
+export type MetricsStreamMessage =
+  | { type: 'snapshot'; key_fields: Record<string, string[]>; data: MonitoringResponse }
+  | { type: 'transitions'; timestamp: string; errors: string[]; transitions: MetricTransition[] }
+  | { type: 'ping' };